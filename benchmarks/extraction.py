@@ -0,0 +1,73 @@
+import argparse
+import time
+
+from parsing import extractors
+from benchmarks.parsers import load_pages
+
+# Сайт -> (схема, селектор элементов-карточек; None - схема применяется ко всей странице)
+SITES = {
+    'artrabbit': (extractors.ARTRABBIT_SCHEMA, 'div.artopp'),
+    'transartists': (extractors.TRANSARTISTS_SCHEMA, 'tr'),
+    'curatorspace': (extractors.CURATORSPACE_SCHEMA, 'div.media-body'),
+    'resartis_cards': (extractors.RESARTIS_CARD_SCHEMA, 'div.grid__item.postcard'),
+    'resartis': (extractors.RESARTIS_DETAIL_SCHEMA, None),
+    'artistcommunities': (extractors.ARTISTCOMMUNITIES_SCHEMA, None),
+    'callforentry': (extractors.CALLFORENTRY_SCHEMA, None),
+}
+
+
+def extract_per_field(schema, root):
+    """Прежний способ: отдельный поиск по всему дереву для каждого поля."""
+    if schema.require and not schema.require.select_one(root):
+        return None
+    record = {}
+    for name, field in schema.fields.items():
+        if field.compiled is None:
+            record[name] = field.value(root)
+        elif field.many:
+            values = [field.value(element) for element in field.compiled.select(root)]
+            record[name] = field.separator.join(values) if values else field.default
+        else:
+            element = field.compiled.select_one(root)
+            record[name] = field.value(element) if element else field.default
+    return record
+
+
+def best_time(func, roots, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for root in roots:
+            func(root)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Время извлечения полей: поиск по полю против схемы.')
+    parser.add_argument('site', choices=sorted(SITES))
+    parser.add_argument('pages_dir', help='Каталог с сохраненными .html страницами сайта')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    schema, item_selector = SITES[args.site]
+    pages = load_pages(args.pages_dir)
+    if not pages:
+        raise SystemExit(f'В {args.pages_dir} нет .html страниц')
+
+    soups = [extractors.make_soup(page) for page in pages]
+    roots = [item for soup in soups for item in soup.select(item_selector)] if item_selector else soups
+
+    mismatches = sum(extract_per_field(schema, root) != schema.extract(root) for root in roots)
+    before = best_time(lambda root: extract_per_field(schema, root), roots, args.repeat)
+    after = best_time(schema.extract, roots, args.repeat)
+
+    print(f'{args.site}: {len(pages)} pages, {len(roots)} records, best of {args.repeat}')
+    print(f'per-field lookups: {before / len(pages) * 1000:.2f} ms/page')
+    print(f'schema single pass: {after / len(pages) * 1000:.2f} ms/page ({before / after:.1f}x)')
+    if mismatches:
+        print(f'WARNING: {mismatches} records differ between the two methods')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import json
+import subprocess
+import sys
+
+# Импорт -> (эталонный импорт его неизбежных зависимостей, допустимое отношение времен).
+# Эталон замеряется в том же запуске, поэтому бюджет не зависит от скорости машины
+IMPORT_BUDGETS = {
+    'import parsing': ('import importlib', 3.0),
+    'from parsing import extract_data, decode_spamspan': ('import bs4, soupsieve', 1.5),
+}
+NOISE_MS = 2.0  # Погрешность замера, которая прибавляется к бюджету
+
+# Модули, которые не должны загружаться при импорте пакета
+HEAVY_MODULES = ['selenium', 'openai', 'pandas', 'pyarrow']
+
+_PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+exec({statement!r})
+elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({{'ms': elapsed, 'loaded': [name for name in {heavy!r} if name in sys.modules]}}))
+'''
+
+
+def measure(statement, repeat=5):
+    """Лучшее время холодного импорта (каждый замер в новом интерпретаторе) и загруженные тяжелые модули."""
+    best, loaded = float('inf'), []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(statement=statement, heavy=HEAVY_MODULES)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output)
+        best, loaded = min(best, result['ms']), result['loaded']
+    return best, loaded
+
+
+def budget_ms(statement, repeat=5):
+    """Бюджет импорта statement по эталону, замеренному сейчас же, в миллисекундах."""
+    baseline, ratio = IMPORT_BUDGETS[statement]
+    return measure(baseline, repeat)[0] * ratio + NOISE_MS
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Проверка времени холодного импорта пакета parsing.')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    for statement in IMPORT_BUDGETS:
+        elapsed, loaded = measure(statement, args.repeat)
+        budget = budget_ms(statement, args.repeat)
+        ok = elapsed <= budget and not loaded
+        failed |= not ok
+        print(f"{'ok' if ok else 'FAIL':<6}{statement:<56}{elapsed:>8.1f} ms (budget {budget:.0f} ms)"
+              + (f", loaded {', '.join(loaded)}" if loaded else ''))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import importlib.util
+import os
+import time
+
+from parsing import extractors
+
+BS4_BACKENDS = [('html.parser', None), ('lxml', 'lxml'), ('html5lib', 'html5lib')]
+
+
+def load_pages(directory):
+    """Загружает сохраненные HTML-страницы из каталога."""
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(('.html', '.htm')):
+            with open(os.path.join(directory, name), 'rb') as file:
+                pages.append(file.read())
+    return pages
+
+
+def best_time_per_page(func, pages, repeat):
+    """Лучшее из repeat прогонов время обработки одной страницы, в миллисекундах."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for page in pages:
+            func(page)
+        best = min(best, time.perf_counter() - started)
+    return best / len(pages) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Сравнение бэкендов разбора HTML на сохраненных страницах.')
+    parser.add_argument('pages_dir', help='Каталог с сохраненными .html страницами')
+    parser.add_argument('--extractor', help='Функция из extractors, например extract_artists_community_details')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages_dir)
+    if not pages:
+        raise SystemExit(f'В {args.pages_dir} нет .html страниц')
+    extract = getattr(extractors, args.extractor) if args.extractor else None
+
+    print(f'{len(pages)} pages, best of {args.repeat}')
+    print(f"{'backend':<14}{'parse ms/page':>16}{'extract ms/page':>18}")
+    for backend, module in BS4_BACKENDS:
+        if module and not importlib.util.find_spec(module):
+            print(f'{backend:<14}{"not installed":>16}')
+            continue
+        parse_ms = best_time_per_page(lambda page: extractors.make_soup(page, backend), pages, args.repeat)
+        extract_ms = ''
+        if extract:
+            extractors.HTML_PARSER = backend
+            extract_ms = f'{best_time_per_page(extract, pages, args.repeat):.2f}'
+        print(f'{backend:<14}{parse_ms:>16.2f}{extract_ms:>18}')
+
+    # selectolax строит дерево без BeautifulSoup, поэтому сравнивается только время разбора
+    if importlib.util.find_spec('selectolax'):
+        from selectolax.parser import HTMLParser
+        parse_ms = best_time_per_page(HTMLParser, pages, args.repeat)
+        print(f"{'selectolax':<14}{parse_ms:>16.2f}{'-':>18}")
+    else:
+        print(f"{'selectolax':<14}{'not installed':>16}")
+
+
+if __name__ == '__main__':
+    main()
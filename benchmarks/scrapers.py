@@ -0,0 +1,131 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from parsing.replay import FixtureArchive, ReplayServer
+
+# Лимитер хостов не должен тормозить локальный сервер
+_UNLIMITED_RATE = '1000000'
+
+
+def run_scraper(name, output):
+    """Запускает парсер в текущем процессе и возвращает его метрики."""
+    from parsing import tracing
+    from parsing.counters import get_counters, scope
+    from parsing.sites import default_tasks
+
+    task = next(task for task in default_tasks() if task['func'].__name__ == name)
+    started = time.perf_counter()
+    with scope(name):
+        task['func'](task['url'], output)
+    wall = time.perf_counter() - started
+
+    parse_seconds = sum(item['sum'] for item in tracing.snapshot() if item['stage'] in ('soup', 'extract'))
+    counters = get_counters(name)
+    pages = counters.get('pages', 0)
+    records = counters.get('records', 0)
+    peak_rss = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    return {
+        'name': name,
+        'wall': wall,
+        'pages': pages,
+        'records': records,
+        'pages_per_sec': pages / wall if wall else 0.0,
+        'records_per_sec': records / wall if wall else 0.0,
+        'parse_ms_per_page': parse_seconds * 1000 / pages if pages else 0.0,
+        'peak_rss_mb': peak_rss / 1024,  # ru_maxrss в КБ (Linux)
+    }
+
+
+def benchmark(name, fixtures, server_url, workdir):
+    """Прогоняет парсер в отдельном процессе на записанных страницах."""
+    env = {
+        **os.environ,
+        'PARSING_REPLAY': 'replay',
+        'PARSING_FIXTURES': fixtures,
+        'PARSING_REPLAY_URL': server_url,
+        'PARSING_CACHE_DIR': os.path.join(workdir, 'cache'),
+        'PARSING_STATE_PATH': os.path.join(workdir, 'state.sqlite'),
+        'PARSING_HOST_RATE': _UNLIMITED_RATE,
+        'PARSING_HOST_MAX_RATE': _UNLIMITED_RATE,
+    }
+    output = os.path.join(workdir, f'{name}.csv')
+    completed = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.scrapers', '--run', name, '--output', output],
+        env=env, capture_output=True, text=True,
+    )
+    if completed.returncode:
+        raise RuntimeError(f"{name} failed:\n{completed.stderr[-2000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline_path, tolerance):
+    """Сравнивает pages/sec с сохраненным прогоном; возвращает список регрессий."""
+    with open(baseline_path, encoding='utf-8') as file:
+        baseline = {result['name']: result for result in json.load(file)}
+    regressions = []
+    for result in results:
+        previous = baseline.get(result['name'])
+        if previous and result['pages_per_sec'] < previous['pages_per_sec'] * (1 - tolerance):
+            regressions.append(
+                f"{result['name']}: {result['pages_per_sec']:.1f} pages/s, was {previous['pages_per_sec']:.1f}"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Сквозной бенчмарк парсеров на записанных страницах (без сети).')
+    parser.add_argument('fixtures', nargs='?', default='fixtures', help='Архив, записанный с PARSING_REPLAY=record')
+    parser.add_argument('--latency', type=float, default=0.05, help='Задержка ответа сервера, в секундах')
+    parser.add_argument('--scraper', action='append', help='Имя функции parse_* (по умолчанию все)')
+    parser.add_argument('--json', help='Сохранить результаты в файл')
+    parser.add_argument('--baseline', help='Файл прошлых результатов для проверки регрессий')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Допустимое падение pages/sec')
+    parser.add_argument('--run', help=argparse.SUPPRESS)
+    parser.add_argument('--output', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run_scraper(args.run, args.output)))
+        return
+
+    from parsing.sites import default_tasks
+
+    names = args.scraper or [task['func'].__name__ for task in default_tasks()]
+    server = ReplayServer(FixtureArchive(args.fixtures), latency=args.latency).start()
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            for name in names:
+                results.append(benchmark(name, os.path.abspath(args.fixtures), server.url, workdir))
+    finally:
+        server.stop()
+
+    print(f"{'scraper':<36}{'pages':>7}{'pages/s':>9}{'parse ms/page':>15}{'records/s':>11}{'peak RSS, MB':>14}")
+    for result in results:
+        print(
+            f"{result['name']:<36}{result['pages']:>7}{result['pages_per_sec']:>9.1f}"
+            f"{result['parse_ms_per_page']:>15.1f}{result['records_per_sec']:>11.1f}{result['peak_rss_mb']:>14.1f}"
+        )
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import tracemalloc
+
+from parsing import extractors
+from benchmarks.parsers import best_time_per_page, load_pages
+
+# Сайт -> (экстрактор страницы списка, имя его SoupStrainer в extractors)
+SITES = {
+    'artrabbit': (extractors.extract_artrabbit_listing, 'ARTRABBIT_STRAINER'),
+    'transartists': (extractors.extract_transartists_listing, 'TRANSARTISTS_STRAINER'),
+    'curatorspace': (extractors.extract_curatorspace_listing, 'CURATORSPACE_STRAINER'),
+    'resartis_cards': (extractors.extract_resartis_cards, 'RESARTIS_CARD_STRAINER'),
+}
+
+
+def peak_memory_per_page(parse, pages):
+    """Наибольший пик памяти (tracemalloc) при построении дерева одной страницы, в КБ."""
+    peak = 0
+    tracemalloc.start()
+    try:
+        for page in pages:
+            tracemalloc.reset_peak()
+            soup = parse(page)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            del soup
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Сравнение полного разбора страниц списков и разбора только нужных поддеревьев.'
+    )
+    parser.add_argument('site', choices=SITES)
+    parser.add_argument('pages_dir', help='Каталог с сохраненными .html страницами списка')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages_dir)
+    if not pages:
+        raise SystemExit(f'В {args.pages_dir} нет .html страниц')
+    extract, strainer_name = SITES[args.site]
+    strainer = getattr(extractors, strainer_name)
+
+    variants = {
+        'full tree': None,
+        'strainer': strainer,
+    }
+    results = {}
+    print(f'{args.site}: {len(pages)} pages, parser {extractors.HTML_PARSER}, best of {args.repeat}')
+    print(f"{'variant':<12}{'parse ms/page':>15}{'extract ms/page':>17}{'peak KB/page':>14}")
+    for name, parse_only in variants.items():
+        # Экстрактор берет strainer из модуля при каждом вызове
+        setattr(extractors, strainer_name, parse_only)
+        parse_ms = best_time_per_page(lambda page: extractors.make_soup(page, parse_only=parse_only), pages, args.repeat)
+        extract_ms = best_time_per_page(extract, pages, args.repeat)
+        peak_kb = peak_memory_per_page(lambda page: extractors.make_soup(page, parse_only=parse_only), pages)
+        results[name] = [extract(page) for page in pages]
+        print(f'{name:<12}{parse_ms:>15.2f}{extract_ms:>17.2f}{peak_kb:>14.0f}')
+    setattr(extractors, strainer_name, strainer)
+
+    if results['full tree'] != results['strainer']:
+        raise SystemExit('Результаты извлечения различаются!')
+
+
+if __name__ == '__main__':
+    main()
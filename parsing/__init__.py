@@ -0,0 +1,42 @@
+import importlib
+
+# Имя -> модуль, откуда оно берется. Модули загружаются при первом обращении,
+# поэтому import parsing не тянет requests, pandas, openai и selenium.
+_EXPORTS = {
+    'extract_data': 'parsing.extractors',
+    'decode_spamspan': 'parsing.extractors',
+    'safe_find': 'parsing.extractors',
+    'get_text_or_none': 'parsing.extractors',
+    'make_soup': 'parsing.extractors',
+    'fetch_page': 'parsing.core',
+    'save_to_csv': 'parsing.core',
+    'save_to_csv_without_duplicates': 'parsing.core',
+    'load_links_from_csv': 'parsing.core',
+    'main': 'parsing.sites',
+    'default_tasks': 'parsing.sites',
+    'parse_csv_file': 'parsing.sites',
+    'parse_artist_opportunities': 'parsing.sites',
+    'parse_transartists': 'parsing.sites',
+    'parse_resartis_opportunities': 'parsing.sites',
+    'parse_curatorspace_opportunities': 'parsing.sites',
+    'parse_artists_communities': 'parsing.sites',
+    'ask_openai': 'parsing.pipeline',
+    'send_post_request': 'parsing.pipeline',
+    'process_csv_and_send_requests': 'parsing.pipeline',
+    'save_results': 'parsing.pipeline',
+    'main_process': 'parsing.pipeline',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_EXPORTS})
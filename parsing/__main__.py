@@ -0,0 +1,9 @@
+from .sites import main
+
+if __name__ == "__main__":
+    main()
+    # parse_csv_file('/content/drive/MyDrive/curatorspace_calls.csv')
+    # добавляем больше файлов для дополнительного парсинга
+    # main_process(
+    #    '/content/drive/MyDrive/open_calls_ready_2',
+    # )
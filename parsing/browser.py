@@ -0,0 +1,172 @@
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from .http_session import get_session
+from .replay import record_page, replayed_page
+from .tracing import stage
+
+BROWSER_POOL_SIZE = int(os.environ.get('PARSING_BROWSERS', 2))
+
+# Ресурсы, которые не нужны для получения HTML и блокируются в браузере
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.css', '*.woff', '*.woff2', '*.ttf', '*.otf',
+]
+
+
+def _chrome_options(user_data_dir):
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    # У каждого браузера пула свой профиль, поэтому фиксированный порт отладки не задается
+    chrome_options.add_argument(f'--user-data-dir={user_data_dir}')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+    return chrome_options
+
+
+class BrowserPool:
+    """Пул переиспользуемых headless Chrome; браузеры запускаются только при первом запросе."""
+
+    def __init__(self, size=BROWSER_POOL_SIZE):
+        self.size = size
+        self._idle = []  # Свободные браузеры, последний освободившийся берется первым
+        self._drivers = {}  # driver -> каталог профиля
+        self._starting = 0
+        # Ждущие браузер просыпаются, когда браузер возвращен в пул или закрыт после ошибки
+        self._available = threading.Condition()
+
+    def _start_driver(self):
+        from selenium import webdriver
+
+        user_data_dir = tempfile.mkdtemp(prefix='chrome-profile-')
+        try:
+            driver = webdriver.Chrome(options=_chrome_options(user_data_dir))
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        except Exception:
+            shutil.rmtree(user_data_dir, ignore_errors=True)
+            raise
+        logging.info(f"Started browser {len(self._drivers) + 1}/{self.size}")
+        return driver, user_data_dir
+
+    def _acquire(self):
+        with self._available:
+            while not self._idle and len(self._drivers) + self._starting >= self.size:
+                self._available.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._starting += 1
+
+        # Браузер запускается без блокировки, чтобы несколько браузеров стартовали параллельно
+        try:
+            driver, user_data_dir = self._start_driver()
+        except Exception:
+            with self._available:
+                self._starting -= 1
+                self._available.notify()
+            raise
+        with self._available:
+            self._starting -= 1
+            self._drivers[driver] = user_data_dir
+        return driver
+
+    def _release(self, driver):
+        with self._available:
+            self._idle.append(driver)
+            self._available.notify()
+
+    def _discard(self, driver):
+        with self._available:
+            user_data_dir = self._drivers.pop(driver, None)
+            if driver in self._idle:
+                self._idle.remove(driver)
+            self._available.notify()
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        if user_data_dir:
+            shutil.rmtree(user_data_dir, ignore_errors=True)
+
+    @contextmanager
+    def driver(self):
+        """Выдает браузер из пула и возвращает его обратно после использования."""
+        driver = self._acquire()
+        try:
+            yield driver
+        except Exception:
+            # После ошибки состояние браузера неизвестно - закрываем его
+            self._discard(driver)
+            raise
+        else:
+            self._release(driver)
+
+    def close(self):
+        """Закрывает все браузеры пула."""
+        with self._available:
+            drivers = list(self._drivers)
+        for driver in drivers:
+            self._discard(driver)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Возвращает общий пул браузеров (браузеры стартуют лениво)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+        return _pool
+
+
+def close_pool():
+    """Закрывает общий пул, если он создавался."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
+def share_cookies(driver, session=None):
+    """Передает cookies браузера в общую HTTP-сессию, чтобы страницы деталей грузились без браузера."""
+    session = session or get_session()
+    for cookie in driver.get_cookies():
+        session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'), path=cookie.get('path', '/'))
+
+
+def render_page(url, wait_for_class=None, timeout=10):
+    """
+    Открывает страницу в браузере из пула и возвращает HTML после выполнения JS.
+    Cookies страницы передаются в HTTP-сессию для дальнейшей загрузки через fetch_page.
+    """
+    content = replayed_page(url)
+    if content is not None:
+        return content
+
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    with stage('render', urlsplit(url).netloc), get_pool().driver() as driver:
+        driver.get(url)
+        if wait_for_class:
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_all_elements_located((By.CLASS_NAME, wait_for_class))
+            )
+        share_cookies(driver)
+        content = driver.page_source
+    record_page(url, content)
+    return content
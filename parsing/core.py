@@ -0,0 +1,127 @@
+import logging
+import random
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+from .counters import incr
+from .http_cache import get_cache
+from .http_session import get_session
+from .pagination import PageNotFound
+from .ratelimit import THROTTLE_STATUSES, get_limiter, retry_after_seconds
+from .replay import record_page, replay_url
+from .sinks import CsvSink
+from .streaming import stream_rows
+from .tracing import stage
+
+FETCH_TIMEOUT = 10
+MAX_RETRIES = 4
+RETRY_STATUSES = THROTTLE_STATUSES | {500, 502, 504}
+NOT_FOUND_STATUSES = {404, 410}
+
+
+def _backoff(attempt):
+    return min(2 ** attempt, 60) + random.uniform(0, 1)
+
+
+def _get(url, headers):
+    """
+    GET с учетом лимитера хоста: повторяет запрос при 429/5xx и сетевых ошибках
+    с экспоненциальной паузой или паузой из Retry-After.
+    """
+    limiter = get_limiter(urlsplit(url).netloc)
+    for attempt in range(MAX_RETRIES + 1):
+        limiter.acquire()
+        try:
+            response = get_session().get(replay_url(url), headers=headers, timeout=FETCH_TIMEOUT)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if attempt == MAX_RETRIES:
+                raise
+            delay = _backoff(attempt)
+            logging.warning(f"Ошибка при запросе {url}: {e}, повтор через {delay:.1f} с")
+        else:
+            if response.status_code not in RETRY_STATUSES:
+                limiter.on_success()
+                return response
+            if attempt == MAX_RETRIES:
+                return response
+            retry_after = retry_after_seconds(response.headers.get('Retry-After'))
+            if response.status_code in THROTTLE_STATUSES:
+                limiter.on_throttle(retry_after)
+            delay = retry_after if retry_after is not None else _backoff(attempt)
+            logging.warning(f"{url} вернул {response.status_code}, повтор через {delay:.1f} с")
+        incr('retries')
+        time.sleep(delay)
+
+
+def fetch_page(url, headers, raise_not_found=False):
+    """
+    Загружает страницу (с учетом дискового кэша) и возвращает HTML-контент или None при ошибке.
+
+    :param raise_not_found: Поднимать PageNotFound, если страницы нет (404/410), чтобы
+                            отличить конец списка страниц от сбоя загрузки.
+    """
+    with stage('fetch', urlsplit(url).netloc):
+        content = _fetch_page(url, headers, raise_not_found)
+    if content is not None:
+        record_page(url, content)
+    return content
+
+
+def _fetch_page(url, headers, raise_not_found):
+    incr('pages')
+    cache = get_cache()
+    entry = cache.lookup(url)
+    if entry and cache.is_fresh(entry):
+        incr('cache_hit')
+        return entry['content']
+
+    request_headers = dict(headers or {})
+    if entry:
+        request_headers.update(cache.validators(entry))
+
+    try:
+        response = _get(url, request_headers)
+        if entry and response.status_code == 304:
+            cache.refresh(url, response.headers)
+            incr('cache_revalidated')
+            return entry['content']
+        if raise_not_found and response.status_code in NOT_FOUND_STATUSES:
+            raise PageNotFound(url)
+        response.raise_for_status()
+        cache.store(url, response.content, response.headers)
+        incr('cache_miss')
+        return response.content
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Ошибка при запросе {url}: {e}")
+        return None
+
+
+def save_to_csv(file_path, data, headers):
+    """Сохраняет данные в CSV-файл."""
+    if not data:
+        logging.warning("Нет данных для сохранения.")
+        return
+    with CsvSink(file_path, fieldnames=headers) as sink:
+        sink.write_many(data)
+
+
+def save_to_csv_without_duplicates(file_path, data):
+    """Сохраняет данные в файл в формате csv без повторений"""
+    if not data:
+        logging.warning("Нет данных для сохранения.")
+        return
+
+    with CsvSink(file_path, dedup=True) as sink:
+        sink.write_many(data)
+    logging.info(f"Файл сохранен по пути: {file_path}")
+
+
+def load_links_from_csv(file_path, checkpoint=None):
+    """
+    Потоково загружает ссылки из CSV файла: генератор пар (номер строки, ссылка).
+    С контрольной точкой чтение продолжается с ее позиции в файле.
+    """
+    for index, row in stream_rows(file_path, checkpoint=checkpoint):
+        yield index, row['Link']  # Предполагается, что столбец называется Link
@@ -0,0 +1,32 @@
+import contextvars
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+# Имя текущего парсера; наследуется потоками загрузки через contextvars
+current_scope = contextvars.ContextVar('current_scope', default='default')
+
+_counters = defaultdict(Counter)
+_lock = threading.Lock()
+
+
+@contextmanager
+def scope(name):
+    """Все счетчики внутри блока относятся к парсеру name."""
+    token = current_scope.set(name)
+    try:
+        yield
+    finally:
+        current_scope.reset(token)
+
+
+def incr(key, amount=1):
+    """Увеличивает счетчик key текущего парсера."""
+    with _lock:
+        _counters[current_scope.get()][key] += amount
+
+
+def get_counters(name=None):
+    """Возвращает копию счетчиков парсера name (по умолчанию текущего)."""
+    with _lock:
+        return dict(_counters[name or current_scope.get()])
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+STATE_PATH = os.environ.get('PARSING_STATE_PATH', 'crawl_state.sqlite')
+
+
+def content_hash(content):
+    """Хэш содержимого страницы."""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+class CrawlState:
+    """
+    Состояние обхода страниц деталей одного сайта: для каждого URL хранится хэш
+    содержимого и последняя извлеченная запись. Страницы загружаются при каждом
+    обходе (неизменившиеся дешево перепроверяются HTTP-кэшем условным запросом),
+    а разбираются только те, содержимое которых изменилось.
+    """
+
+    def __init__(self, name, path=STATE_PATH, fieldnames=None):
+        """
+        :param fieldnames: Поля записи; записи старого формата (списки значений) переводятся
+            в словари по этим полям, а без них удаляются, и страницы разбираются заново.
+        """
+        self.name = name
+        self._db = sqlite3.connect(path)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                scope TEXT NOT NULL,
+                url TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                record TEXT NOT NULL,
+                checked_at REAL NOT NULL,
+                PRIMARY KEY (scope, url)
+            )
+        """)
+        self._migrate(fieldnames)
+
+    def _migrate(self, fieldnames):
+        rows = self._db.execute(
+            "SELECT url, record FROM pages WHERE scope = ? AND record LIKE '[%'", (self.name,)
+        ).fetchall()
+        for url, record in rows:
+            if fieldnames:
+                self._db.execute(
+                    'UPDATE pages SET record = ? WHERE scope = ? AND url = ?',
+                    (json.dumps(dict(zip(fieldnames, json.loads(record))), ensure_ascii=False), self.name, url)
+                )
+            else:
+                self._db.execute('DELETE FROM pages WHERE scope = ? AND url = ?', (self.name, url))
+        self._db.commit()
+
+    def _row(self, url):
+        return self._db.execute(
+            'SELECT content_hash, record, checked_at FROM pages WHERE scope = ? AND url = ?', (self.name, url)
+        ).fetchone()
+
+    def is_unchanged(self, url, digest):
+        """Проверяет, совпадает ли содержимое с прошлым разбором; если да - отмечает страницу проверенной."""
+        row = self._row(url)
+        if row is None or row[0] != digest:
+            return False
+        self._db.execute(
+            'UPDATE pages SET checked_at = ? WHERE scope = ? AND url = ?', (time.time(), self.name, url)
+        )
+        self._db.commit()
+        return True
+
+    def save(self, url, digest, record):
+        """Сохраняет хэш страницы и извлеченную из нее запись."""
+        self._db.execute(
+            'INSERT OR REPLACE INTO pages (scope, url, content_hash, record, checked_at) VALUES (?, ?, ?, ?, ?)',
+            (self.name, url, digest, json.dumps(record, ensure_ascii=False), time.time())
+        )
+        self._db.commit()
+
+    def records(self, urls):
+        """Возвращает сохраненные записи для списка URL в том же порядке."""
+        result = []
+        for url in urls:
+            row = self._row(url)
+            if row:
+                result.append(json.loads(row[1]))
+        return result
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,198 @@
+import hashlib
+import logging
+import os
+import random
+import re
+import sqlite3
+import threading
+from array import array
+
+DEDUP_PATH = os.environ.get('PARSING_DEDUP_PATH', 'dedup_index.sqlite')
+NUM_PERM = 128
+BANDS = 32  # 32 полосы по 4 строки: пара с похожестью 0.7 становится кандидатом почти наверняка
+THRESHOLD = 0.7  # Минимальная оценка коэффициента Жаккара для дубликата
+SHINGLE_SIZE = 3
+SEED = 1
+
+# Колонки с названием и описанием в файлах разных сайтов
+TITLE_FIELDS = ('Open_Call_Title', 'Title', 'title')
+DESCRIPTION_FIELDS = ('Description', 'description', 'Short Description', 'Open call description')
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(SEED)
+# Параметры универсальных хэш-функций (a * x + b) mod p; фиксированы, чтобы индекс был переносим между запусками
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+
+
+def normalize_text(text):
+    """Нижний регистр, только буквы и цифры, одиночные пробелы."""
+    return ' '.join(re.findall(r'\w+', str(text).lower()))
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Множество хэшей словесных n-грамм текста."""
+    words = normalize_text(text).split()
+    grams = {' '.join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))}
+    return {
+        int.from_bytes(hashlib.blake2b(gram.encode('utf-8'), digest_size=8).digest(), 'little')
+        for gram in grams if gram
+    }
+
+
+def minhash(hashes):
+    """MinHash-подпись множества хэшей: NUM_PERM минимумов."""
+    if not hashes:
+        return array('Q', [_MERSENNE_PRIME] * NUM_PERM)
+    return array('Q', (
+        min((a * value + b) % _MERSENNE_PRIME for value in hashes)
+        for a, b in _PERMUTATIONS
+    ))
+
+
+def similarity(first, second):
+    """Оценка коэффициента Жаккара по двум подписям."""
+    return sum(x == y for x, y in zip(first, second)) / NUM_PERM
+
+
+def record_text(row):
+    """Название и описание open call из строки любого источника."""
+    parts = [row.get(name) for name in (*TITLE_FIELDS, *DESCRIPTION_FIELDS)]
+    return ' '.join(str(part) for part in parts if part and part == part)  # part == part отсекает NaN
+
+
+def _band_keys(signature):
+    rows = NUM_PERM // BANDS
+    return [
+        (band, hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(), digest_size=8).hexdigest())
+        for band in range(BANDS)
+    ]
+
+
+class DedupIndex:
+    """
+    Постоянный LSH-индекс MinHash-подписей. Поиск похожих записей идет только по
+    совпавшим полосам подписи, поэтому не зависит от размера индекса линейно.
+    """
+
+    def __init__(self, path=DEDUP_PATH):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        # В индексе старого формата текст был уникален, и точная копия не считалась дубликатом:
+        # его записи переносятся в новую таблицу без номеров строк
+        columns = [row[1] for row in self._db.execute('PRAGMA table_info(records)')]
+        legacy = bool(columns) and 'position' not in columns
+        if legacy:
+            self._db.execute('ALTER TABLE records RENAME TO records_old')
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS records (
+                id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL,  -- хэш нормализованного текста
+                source TEXT,
+                position INTEGER,  -- номер строки в источнике
+                signature BLOB NOT NULL,
+                duplicate_of INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS records_key ON records (key);
+            CREATE TABLE IF NOT EXISTS bands (
+                band INTEGER NOT NULL,
+                bucket TEXT NOT NULL,
+                record_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS bands_bucket ON bands (band, bucket);
+        """)
+        if legacy:
+            with self._db:
+                self._db.execute("""
+                    INSERT INTO records (id, key, source, signature, duplicate_of)
+                    SELECT id, key, source, signature, duplicate_of FROM records_old
+                """)
+                self._db.execute('DROP TABLE records_old')
+
+    def check(self, text, source=None, position=None):
+        """
+        Добавляет запись в индекс и ищет ее дубликаты: точные копии текста и почти-дубликаты.
+
+        Повторная проверка той же строки (тот же источник и position) при перезапуске
+        возвращает ее прежний результат, а не помечает строку дубликатом самой себя.
+
+        :param position: Номер строки в источнике.
+        :return: (id записи, id оригинала или None, если запись не дубликат).
+        """
+        key = hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+        signature = minhash(shingles(text))
+        band_keys = _band_keys(signature)
+
+        with self._lock:
+            copies = self._db.execute(
+                'SELECT id, duplicate_of, source, position FROM records WHERE key = ? ORDER BY id', (key,)
+            ).fetchall()
+            for record_id, duplicate_of, stored_source, stored_position in copies:
+                # Записи старого индекса без номера строки относятся к первой проверке того же источника
+                if stored_source == source and stored_position in (position, None):
+                    if stored_position is None and position is not None:
+                        self._db.execute('UPDATE records SET position = ? WHERE id = ?', (position, record_id))
+                        self._db.commit()
+                    return record_id, duplicate_of
+            if copies:
+                # Точная копия: подпись та же, поэтому полосы не нужны, оригинал - первая копия
+                original = copies[0][1] or copies[0][0]
+                record_id = self._db.execute(
+                    'INSERT INTO records (key, source, position, signature, duplicate_of) VALUES (?, ?, ?, ?, ?)',
+                    (key, source, position, signature.tobytes(), original)
+                ).lastrowid
+                self._db.commit()
+                return record_id, original
+
+            candidates = set()
+            for band, bucket in band_keys:
+                candidates.update(
+                    record_id for record_id, in self._db.execute(
+                        'SELECT record_id FROM bands WHERE band = ? AND bucket = ?', (band, bucket)
+                    )
+                )
+
+            original = None
+            best = THRESHOLD
+            for record_id in sorted(candidates):
+                stored, duplicate_of = self._db.execute(
+                    'SELECT signature, duplicate_of FROM records WHERE id = ?', (record_id,)
+                ).fetchone()
+                score = similarity(signature, array('Q', stored))
+                if score >= best:
+                    original, best = duplicate_of or record_id, score
+
+            record_id = self._db.execute(
+                'INSERT INTO records (key, source, position, signature, duplicate_of) VALUES (?, ?, ?, ?, ?)',
+                (key, source, position, signature.tobytes(), original)
+            ).lastrowid
+            self._db.executemany(
+                'INSERT INTO bands (band, bucket, record_id) VALUES (?, ?, ?)',
+                [(band, bucket, record_id) for band, bucket in band_keys]
+            )
+            self._db.commit()
+        return record_id, original
+
+    def close(self):
+        self._db.close()
+
+
+def mark_duplicates(rows, index=None, source=None, position=None):
+    """
+    Помечает дубликаты и почти-дубликаты среди строк (и ранее проиндексированных записей).
+
+    :param position: Необязательная функция position(row) -> номер строки в источнике
+                     (по умолчанию порядковый номер строки в rows).
+    :return: Генератор пар (строка, id оригинала или None).
+    """
+    own_index = index is None
+    index = index or DedupIndex()
+    duplicates = 0
+    try:
+        for number, row in enumerate(rows):
+            _, original = index.check(record_text(row), source, position(row) if position else number)
+            duplicates += original is not None
+            yield row, original
+    finally:
+        if own_index:
+            index.close()
+        logging.info(f"Near-duplicate check: {duplicates} duplicates found in {source or 'rows'}")
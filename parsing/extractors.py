@@ -0,0 +1,288 @@
+import importlib.util
+import os
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from .schema import Field, Schema
+from .tracing import traced
+
+
+def _default_parser():
+    """lxml заметно быстрее встроенного html.parser, если он установлен."""
+    return 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+
+# Бэкенд BeautifulSoup: 'lxml', 'html.parser' или 'html5lib'
+HTML_PARSER = os.environ.get('PARSING_HTML_PARSER') or _default_parser()
+
+
+# Поддеревья, которые нужны экстракторам страниц списков; остальная страница
+# (навигация, скрипты, подвал) в дерево не попадает. html5lib их не поддерживает.
+ARTRABBIT_STRAINER = SoupStrainer('div', class_='artopp')
+TRANSARTISTS_STRAINER = SoupStrainer('tr')
+CURATORSPACE_STRAINER = SoupStrainer('div', class_='media-body')
+RESARTIS_CARD_STRAINER = SoupStrainer('div', class_='postcard')
+
+
+@traced('soup')
+def make_soup(html, parser=None, parse_only=None):
+    """Строит дерево BeautifulSoup выбранным бэкендом (при parse_only - только нужные поддеревья)."""
+    return BeautifulSoup(html, parser or HTML_PARSER, parse_only=parse_only)
+
+
+def extract_data(
+        soup,
+        tag=None,
+        class_=None,
+        text=None,
+        attribute=None,
+        find_next=False,
+        default="No data",
+        element=None
+):
+    """
+    Универсальная функция для извлечения данных из HTML.
+
+    :param soup: BeautifulSoup объект или HTML-элемент.
+    :param tag: Тег для поиска.
+    :param class_: Класс элемента.
+    :param text: Текст элемента.
+    :param attribute: Атрибут для извлечения (например, href).
+    :param find_next: Найти следующий элемент (например, span).
+    :param default: Значение по умолчанию, если элемент не найден.
+    :param element: Конкретный HTML-элемент (если уже найден ранее).
+    :return: Извлеченные данные или значение по умолчанию.
+    """
+    try:
+        # Если передан элемент, работаем с ним, иначе используем soup
+        search_area = element if element else soup
+        found = search_area.find(tag, class_=class_, text=text)
+
+        if find_next and found:
+            found = found.find_next('span')
+
+        if attribute and found:
+            return found[attribute]
+
+        return found.get_text(strip=True) if found else default
+    except Exception:
+        return default
+
+
+def decode_spamspan(spamspan_element):
+    """Обрабатывает адреса электронной почты"""
+    email_parts = spamspan_element.find_all('span')
+    return ''.join(part.get_text(strip=True) for part in email_parts).replace('[at]', '@').replace('[dot]', '.')
+
+
+def safe_find(soup, selector, attribute=None, text_only=False, separator=' ', strip=True):
+    try:
+        element = soup.select_one(selector)
+        if text_only:
+            return element.get_text(separator=separator, strip=strip) if element else ''
+        if attribute:
+            return element[attribute] if element and attribute in element.attrs else ''
+        return element.text.strip() if element else ''
+    except AttributeError:
+        return ''
+
+
+def get_text_or_none(element):
+    return element.get_text(strip=True) if element else 'N/A'
+
+
+def _deadline_text(element):
+    return element.get_text(strip=True).replace('Deadline: ', '')
+
+
+def _curatorspace_link(element):
+    href = element.get('href')
+    return "https://www.curatorspace.com" + href if href else None
+
+
+def _node_content(selector):
+    """Поля artistcommunities.org ищутся внутри .node__content."""
+    return f'.node__content {selector}'
+
+
+ARTRABBIT_SCHEMA = Schema({
+    'Data-d': Field(attribute='data-d', default=''),
+    'Data-a': Field(attribute='data-a', default=''),
+    'Heading': Field('h3.b_categorical-heading.mod--artopps', default='No data'),
+    'Alert': Field('p.b_ending-alert.mod--just-opened', default='No data'),
+    'Title': Field('h2', default='No data'),
+    'Date Updated': Field('p.b_date', default='No data'),
+    'Body': Field('div.m_body-copy', default='No data'),
+    'URL': Field('a.b_submit.mod--next', attribute='href', default=''),
+})
+
+TRANSARTISTS_SCHEMA = Schema({
+    'Date': Field('td.views-field.views-field-created', default='No data'),
+    'Title': Field('td.views-field-field-your-ad h2', default='No data'),
+    'Description': Field('td.views-field-field-your-ad p', many=True, separator=' ', default=''),
+    'Email': Field('td.views-field-field-your-ad a.spamspan', convert=decode_spamspan, default=''),
+    'Website': Field('td.views-field-field-your-ad a[href*="http"]', attribute='href', default=''),
+}, require='td.views-field.views-field-field-your-ad')
+
+CURATORSPACE_SCHEMA = Schema({
+    'Title': Field('h4.media-heading', default='No data'),
+    'Deadline': Field('strong', convert=_deadline_text, default='No data'),
+    'Location Info': Field('p.details', default='No data'),
+    'Short Description': Field('p.description', default='No data'),
+    'Link': Field('a.btn-sm.btn.btn-info', convert=_curatorspace_link, default=None),
+})
+
+RESARTIS_CARD_SCHEMA = Schema({
+    'link': Field('a', attribute='href', default=None),
+    'title': Field('h2.card__title', default='No title'),
+})
+
+RESARTIS_DETAIL_SCHEMA = Schema({
+    'description': Field('div.entry-content', default='No description'),
+})
+
+# Заголовки h5 на странице open call resartis.org -> имя поля
+RESARTIS_LABELS = {
+    'Duration of residency': 'duration',
+    'Accommodation': 'accommodation',
+    'Disciplines, work equipment and assistance': 'disciplines',
+    'Studio / Workspace': 'studio',
+    'Fees and support': 'fees',
+    'Expectations towards the artist': 'expectations',
+    'Application information': 'application_info',
+    'Application deadline': 'application_deadline',
+    'Residency starts': 'residency_starts',
+    'Residency ends': 'residency_ends',
+    'Location': 'location',
+}
+RESARTIS_LINK_LABEL = 'Link to more information'
+
+ARTISTCOMMUNITIES_SCHEMA = Schema({
+    'Title': Field('h1'),
+    'Associated Residency Program': Field(_node_content('.field--name-field-associated-residency .field__item a')),
+    'Organization': Field(
+        _node_content(r'.field-pseudo-field--pseudo-group_node\:organization-link-list .field__item a')),
+    'Description': Field(_node_content('.field--name-field-oc-residency-description .field__item')),
+    'Deadline': Field(_node_content('.field--name-field-deadline .datetime')),
+    'Application URL': Field(_node_content('.field--name-field-application-url .field__item a')),
+    'Residency Length': Field(
+        _node_content('.field--label-inline.field-pseudo-field--pseudo-residency-length .field__item')),
+    'Languages': Field(_node_content('.field--name-field-languages .field__item')),
+    'Average Number of Artists': Field(_node_content('.field--name-field-average-artists .field__item')),
+    'Collaborative Residency': Field(_node_content('.field--name-field-collaborative-residency .field__item')),
+    'Disciplines': Field(_node_content('.field--name-field-discipline .field__item'), many=True, default=''),
+    'Companions': Field(_node_content('.field--name-field-companions .field__item')),
+    'Country of Residence': Field(_node_content('.field--name-field-country-of-residence .field__item')),
+    'Family Friendly': Field(_node_content('.field--name-field-family-friendly .field__item')),
+    'Stage of Career': Field(_node_content('.field--name-field-stage-of-career .field__item')),
+    'Additional Expectations': Field(_node_content('.field--name-field-additional-expectations .field__item')),
+    'Accessible Housing': Field(_node_content('.field--name-field-accessible-housing .field__item')),
+    'Meals Provided': Field(_node_content('.field--name-field-meals-provided .field__item'), many=True, default=''),
+    'Studios/Special Equipment': Field(
+        _node_content('.field--name-field-studios-special-equipment .field__item'), many=True, default=''),
+    'Studios/Facilities Accessibility': Field(
+        _node_content('.field--name-field-studios-accessibility .field__item')),
+    'Type of Housing': Field(_node_content('.field--name-field-type-of-housing .field__item')),
+    'Additional Eligibility Information': Field(
+        _node_content('.field--name-field-additional-eligibility .field__item')),
+    'Number of Artists Accepted': Field(_node_content('.field--name-field-number-of-artists-accepted .field__item')),
+    'Total Applicant Pool': Field(_node_content('.field--name-field-applicant-pool .field__item')),
+    'Artist Stipend': Field(_node_content('.field--name-field-artist-stipend .field__item')),
+    'Travel Stipend': Field(_node_content('.field--name-field-travel-stipend .field__item')),
+    'Residency Fees': Field(_node_content('.field--name-field-residency-fees .field__item')),
+    'Grant/Scholarship Support': Field(_node_content('.field--name-field-grant-scholarship .field__item')),
+    'Application Fee': Field(_node_content('.field--name-field-application-fee .field__item')),
+    'Application Type': Field(_node_content('.field--name-field-application-type .field__item')),
+}, require='.node__content')
+
+# Поля страниц artistcallforentry
+CALLFORENTRY_SCHEMA = Schema({
+    'title': Field('h1.title', text_separator=' ', default=''),
+    'call_type': Field('.field-name-field-open-call-type ul', text_separator=' ', default=''),
+    'industry': Field('.field-name-field-opencall-industry ul', text_separator=' ', default=''),
+    'category': Field('.field-name-field-category-addapost ul', text_separator=' ', default=''),
+    'theme': Field('.field-name-field-open-call-theme ul', text_separator=' ', default=''),
+    'country': Field('.field-name-field-tags-news-country ul', text_separator=' ', default=''),
+    'organisation': Field('.field-name-field-organisation ul', text_separator=' ', default=''),
+    'eligibility': Field('.field-name-field-eligibility ul', text_separator=' ', default=''),
+    'keywords': Field('.field-name-field-tags-news ul', text_separator=' ', default=''),
+    'description': Field('.field-name-field-description', text_separator=' ', default=''),
+    'prize_summary': Field('.field-name-field-prize-summary', text_separator=' ', default=''),
+    'prizes_details': Field('.field-name-field-opencall-prizes', text_separator=' ', default=''),
+    'event_date': Field('.field-name-field-opencall-event-date', text_separator=' ', default=''),
+    'deadline': Field('.field-name-field-deadline-data', text_separator=' ', default=''),
+    'entry_fee': Field('.field-name-field-entry-fee ul', text_separator=' ', default=''),
+    'fee_detail': Field('.field-name-field-application-fee', text_separator=' ', default=''),
+    'contact_links': Field('.field-name-field-post-contact-links', text_separator=' ', default=''),
+    'instagram': Field('.field-name-field-opencall-instagram a', attribute='href', default=''),
+})
+
+
+def extract_artrabbit_listing(html):
+    """Извлекает карточки возможностей со страницы artrabbit.com."""
+    soup = make_soup(html, parse_only=ARTRABBIT_STRAINER)
+    return [ARTRABBIT_SCHEMA.extract(item) for item in soup.find_all('div', class_='artopp')]
+
+
+def extract_transartists_listing(html):
+    """Извлекает объявления со страницы списка transartists.org."""
+    soup = make_soup(html, parse_only=TRANSARTISTS_STRAINER)
+    records = (TRANSARTISTS_SCHEMA.extract(row) for row in soup.find_all('tr'))
+    return [record for record in records if record]
+
+
+def extract_curatorspace_listing(html):
+    """Извлекает возможности со страницы списка curatorspace.com (без ссылки запись пропускается)."""
+    soup = make_soup(html, parse_only=CURATORSPACE_STRAINER)
+    records = (CURATORSPACE_SCHEMA.extract(opp) for opp in soup.find_all('div', class_='media-body'))
+    return [record for record in records if record['Link']]
+
+
+def extract_resartis_cards(html):
+    """Возвращает карточки open call со страницы списка resartis.org."""
+    soup = make_soup(html, parse_only=RESARTIS_CARD_STRAINER)
+    return [RESARTIS_CARD_SCHEMA.extract(item) for item in soup.find_all('div', class_='grid__item postcard')]
+
+
+def extract_callforentry_details(html):
+    """Извлекает поля CALLFORENTRY_SCHEMA со страницы open call."""
+    return CALLFORENTRY_SCHEMA.extract(make_soup(html))
+
+
+def extract_labels(soup, tag='h5'):
+    """За один проход по заголовкам tag строит словарь: текст заголовка -> элемент заголовка."""
+    labels = {}
+    for heading in soup.find_all(tag):
+        label = heading.get_text(strip=True)
+        if label and label not in labels:
+            labels[label] = heading
+    return labels
+
+
+def extract_resartis_details(html):
+    """
+    Извлекает данные страницы open call с resartis.org. Заголовки, которых нет
+    в RESARTIS_LABELS, возвращаются в поле '_unknown_labels'.
+    """
+    detail_soup = make_soup(html)
+    labels = extract_labels(detail_soup)
+
+    record = RESARTIS_DETAIL_SCHEMA.extract(detail_soup)
+    for label, field_name in RESARTIS_LABELS.items():
+        heading = labels.get(label)
+        value = heading.find_next('span') if heading else None
+        record[field_name] = value.get_text(strip=True) if value else "No data"
+
+    heading = labels.get(RESARTIS_LINK_LABEL)
+    link = heading.find_next('a', href=True) if heading else None
+    record['more_info_link'] = link['href'] if link else "No data"
+
+    record['_unknown_labels'] = [
+        label for label in labels if label not in RESARTIS_LABELS and label != RESARTIS_LINK_LABEL
+    ]
+    return record
+
+
+def extract_artists_community_details(html):
+    """Извлекает данные страницы open call с artistcommunities.org (None, если контента нет)."""
+    return ARTISTCOMMUNITIES_SCHEMA.extract(make_soup(html))
@@ -0,0 +1,142 @@
+import asyncio
+import contextvars
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_CONCURRENCY = 10
+
+
+class FetchEngine:
+    """Асинхронный движок загрузки страниц с общим лимитом параллельности (частоту по хостам ограничивает fetch)."""
+
+    def __init__(self, fetch, concurrency=DEFAULT_CONCURRENCY):
+        """
+        :param fetch: Блокирующая функция загрузки fetch(url, headers) -> bytes | None.
+        :param concurrency: Максимальное число одновременных запросов.
+        """
+        self.fetch = fetch
+        self.concurrency = concurrency
+
+    async def _fetch_one(self, executor, semaphore, url, headers):
+        try:
+            loop = asyncio.get_running_loop()
+            context = contextvars.copy_context()
+            content = await loop.run_in_executor(executor, context.run, self.fetch, url, headers)
+            return url, content
+        except Exception as e:
+            logging.error(f"Ошибка при загрузке {url}: {e}")
+            return url, None
+        finally:
+            semaphore.release()
+
+    async def fetch_all(self, urls, headers=None):
+        """
+        Асинхронно загружает ссылки и отдает пары (url, content) по мере готовности.
+
+        :param urls: Асинхронный итератор ссылок.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pending = set()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            try:
+                # Ссылки берутся из итератора лениво: новая задача ставится только при свободном слоте
+                async for url in urls:
+                    await semaphore.acquire()
+                    pending.add(asyncio.create_task(self._fetch_one(executor, semaphore, url, headers)))
+                    done = {task for task in pending if task.done()}
+                    pending -= done
+                    for task in done:
+                        yield task.result()
+
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+            finally:
+                for task in pending:
+                    task.cancel()
+
+
+def fetch_pages(urls, fetch, headers=None, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Пакетная загрузка страниц: принимает список ссылок и отдает пары (url, content)
+    в порядке завершения запросов. Цикл asyncio работает в фоновом потоке,
+    поэтому функцию можно вызывать из обычного синхронного кода.
+
+    Ссылки берутся из urls в вызывающем потоке, не больше 2 * concurrency наперед,
+    и передаются циклу через очередь; если потребитель перестает читать результаты,
+    загрузка отменяется.
+    """
+    engine = FetchEngine(fetch, concurrency=concurrency)
+    limit = concurrency * 2
+    # Результатов не бывает больше, чем ссылок в работе, поэтому поток цикла не блокируется на put
+    results = queue.Queue(maxsize=limit + 1)
+    finished = object()
+    started = threading.Event()
+    state = {}
+
+    async def queued_links():
+        while True:
+            url = await state['links'].get()
+            if url is finished:
+                return
+            yield url
+
+    async def pump():
+        state['loop'] = asyncio.get_running_loop()
+        state['task'] = asyncio.current_task()
+        state['links'] = asyncio.Queue()
+        started.set()
+        async for item in engine.fetch_all(queued_links(), headers):
+            results.put(item)
+
+    def run():
+        try:
+            asyncio.run(pump())
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logging.error(f"Ошибка в движке загрузки: {e}")
+        finally:
+            started.set()
+            results.put(finished)
+
+    def send(url):
+        try:
+            state['loop'].call_soon_threadsafe(state['links'].put_nowait, url)
+            return True
+        except (KeyError, RuntimeError):
+            # Цикл уже завершился с ошибкой
+            return False
+
+    context = contextvars.copy_context()
+    thread = threading.Thread(target=context.run, args=(run,), daemon=True)
+    thread.start()
+    started.wait()
+
+    urls = iter(urls)
+    in_flight = 0
+    feeding = True
+    try:
+        while True:
+            while feeding and in_flight < limit:
+                url = next(urls, finished)
+                if url is finished or not send(url):
+                    feeding = False
+                    send(finished)
+                else:
+                    in_flight += 1
+            item = results.get()
+            if item is finished:
+                break
+            in_flight -= 1
+            yield item
+    finally:
+        if thread.is_alive():
+            try:
+                state['loop'].call_soon_threadsafe(state['task'].cancel)
+            except (KeyError, RuntimeError):
+                pass
+        thread.join()
@@ -0,0 +1,168 @@
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from .counters import get_counters
+
+CACHE_DIR = os.environ.get('PARSING_CACHE_DIR', '.http_cache')
+DEFAULT_TTL = 6 * 60 * 60  # Сколько секунд ответ считается свежим без перепроверки
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # Предельный размер сжатых тел в кэше
+
+
+class HttpCache:
+    """
+    Дисковый кэш HTTP-ответов. Тела хранятся сжатыми и адресуются по sha256 содержимого,
+    индекс (URL -> хэш, ETag, Last-Modified, время) лежит в SQLite.
+    """
+
+    def __init__(self, directory=CACHE_DIR, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(directory, 'objects'), exist_ok=True)
+        self._lock = threading.Lock()
+        # Кэш общий для воркеров очереди: WAL и ожидание блокировки вместо "database is locked"
+        self._db = sqlite3.connect(os.path.join(directory, 'index.sqlite'), timeout=60, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+            CREATE INDEX IF NOT EXISTS entries_digest ON entries (digest);
+            CREATE TABLE IF NOT EXISTS objects (
+                digest TEXT PRIMARY KEY,
+                size INTEGER NOT NULL
+            );
+        """)
+
+    def _object_path(self, digest):
+        return os.path.join(self.directory, 'objects', digest[:2], digest + '.gz')
+
+    def lookup(self, url):
+        """Возвращает запись кэша для URL (словарь с content и валидаторами) или None."""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT digest, etag, last_modified, stored_at FROM entries WHERE url = ?', (url,)
+            ).fetchone()
+            if not row:
+                return None
+            digest, etag, last_modified, stored_at = row
+            try:
+                with gzip.open(self._object_path(digest), 'rb') as file:
+                    content = file.read()
+            except OSError:
+                # Тело пропало с диска - забываем запись
+                self._db.execute('DELETE FROM entries WHERE url = ?', (url,))
+                self._db.commit()
+                return None
+            self._db.execute('UPDATE entries SET accessed_at = ? WHERE url = ?', (time.time(), url))
+            self._db.commit()
+        return {'content': content, 'etag': etag, 'last_modified': last_modified, 'stored_at': stored_at}
+
+    def is_fresh(self, entry):
+        """Проверяет, можно ли отдать запись без запроса к серверу."""
+        return time.time() - entry['stored_at'] < self.ttl
+
+    @staticmethod
+    def validators(entry):
+        """Заголовки условного запроса для перепроверки записи."""
+        headers = {}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, content, response_headers):
+        """Сохраняет тело ответа и его валидаторы."""
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+        now = time.time()
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Имя уникально между процессами: у воркеров может совпасть идентификатор потока
+                tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+                with gzip.open(tmp_path, 'wb') as file:
+                    file.write(content)
+                os.replace(tmp_path, path)
+            old = self._db.execute('SELECT digest FROM entries WHERE url = ?', (url,)).fetchone()
+            self._db.execute(
+                'INSERT OR REPLACE INTO objects (digest, size) VALUES (?, ?)', (digest, os.path.getsize(path))
+            )
+            self._db.execute(
+                'INSERT OR REPLACE INTO entries (url, digest, etag, last_modified, stored_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (url, digest, response_headers.get('ETag'), response_headers.get('Last-Modified'), now, now)
+            )
+            # Содержимое страницы изменилось: старое тело больше не нужно, если на него не ссылаются другие URL
+            if old and old[0] != digest:
+                self._drop_object(old[0])
+            self._evict()
+            self._db.commit()
+
+    def refresh(self, url, response_headers):
+        """Отмечает запись как перепроверенную после ответа 304 Not Modified."""
+        with self._lock:
+            self._db.execute(
+                'UPDATE entries SET stored_at = ?, '
+                'etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE url = ?',
+                (time.time(), response_headers.get('ETag'), response_headers.get('Last-Modified'), url)
+            )
+            self._db.commit()
+
+    def _evict(self):
+        """Удаляет давно не использованные записи, пока кэш больше max_bytes."""
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM objects').fetchone()[0]
+        while total > self.max_bytes:
+            row = self._db.execute('SELECT url, digest FROM entries ORDER BY accessed_at LIMIT 1').fetchone()
+            if not row:
+                break
+            url, digest = row
+            self._db.execute('DELETE FROM entries WHERE url = ?', (url,))
+            total -= self._drop_object(digest)
+
+    def _drop_object(self, digest):
+        """Удаляет тело, на которое не ссылается ни один URL; возвращает освобожденный размер."""
+        # Одно тело может принадлежать нескольким URL
+        if self._db.execute('SELECT 1 FROM entries WHERE digest = ? LIMIT 1', (digest,)).fetchone():
+            return 0
+        row = self._db.execute('SELECT size FROM objects WHERE digest = ?', (digest,)).fetchone()
+        self._db.execute('DELETE FROM objects WHERE digest = ?', (digest,))
+        try:
+            os.remove(self._object_path(digest))
+        except OSError:
+            pass
+        return row[0] if row else 0
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Возвращает общий дисковый кэш (создается при первом обращении)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HttpCache()
+        return _cache
+
+
+def log_cache_stats(name):
+    """Пишет в лог счетчики кэша для парсера name."""
+    stats = get_counters(name)
+    logging.info(
+        f"Cache for {name}: {stats.get('cache_hit', 0)} hits, {stats.get('cache_miss', 0)} misses, "
+        f"{stats.get('cache_revalidated', 0)} revalidated"
+    )
@@ -0,0 +1,82 @@
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+DEFAULT_POOL_SIZE = 10
+# Сколько хостов без отдельного пула (artrabbit, страницы деталей resartis и т.п.) держат соединения одновременно
+DEFAULT_POOL_HOSTS = 32
+
+# Размер пула соединений для отдельных хостов (остальные получают DEFAULT_POOL_SIZE)
+POOL_SIZES = {
+    'artistcommunities.org': 16,
+    'resartis.org': 16,
+    'www.transartists.org': 8,
+    'www.curatorspace.com': 8,
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _make_adapter(pool_size, hosts=1):
+    # pool_connections - число пулов хостов, которые адаптер держит открытыми
+    return HTTPAdapter(pool_connections=hosts, pool_maxsize=pool_size, pool_block=True)
+
+
+def _mount_pools(session, pool_sizes):
+    replaced = set(session.adapters.values())
+    session.mount('https://', _make_adapter(DEFAULT_POOL_SIZE, DEFAULT_POOL_HOSTS))
+    session.mount('http://', _make_adapter(DEFAULT_POOL_SIZE, DEFAULT_POOL_HOSTS))
+    for host, size in pool_sizes.items():
+        session.mount(f'https://{host}/', _make_adapter(size))
+        session.mount(f'http://{host}/', _make_adapter(size))
+    # Соединения замененных адаптеров закрываем, иначе они остаются открытыми до выхода
+    for adapter in replaced - set(session.adapters.values()):
+        adapter.close()
+
+
+def get_session():
+    """Возвращает общую сессию requests с пулом keep-alive соединений."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            # ACCEPT_ENCODING включает br, если установлен brotli
+            session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+            session.headers['Connection'] = 'keep-alive'
+            _mount_pools(session, POOL_SIZES)
+            _session = session
+        return _session
+
+
+def configure_pools(pool_sizes):
+    """Задает размеры пулов соединений по хостам и пересоздает адаптеры общей сессии."""
+    POOL_SIZES.update(pool_sizes)
+    _mount_pools(get_session(), POOL_SIZES)
+
+
+def connection_stats():
+    """Возвращает по каждому хосту число запросов, открытых соединений и повторных использований."""
+    stats = {}
+    for adapter in set(get_session().adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools[key]
+            host_stats = stats.setdefault(pool.host, {'requests': 0, 'connections': 0, 'reused': 0})
+            host_stats['requests'] += pool.num_requests
+            host_stats['connections'] += pool.num_connections
+            host_stats['reused'] += max(pool.num_requests - pool.num_connections, 0)
+    return stats
+
+
+def log_connection_stats():
+    """Пишет в лог статистику повторного использования соединений."""
+    for host, host_stats in sorted(connection_stats().items()):
+        logging.info(
+            f"Connections for {host}: {host_stats['requests']} requests, "
+            f"{host_stats['connections']} opened, {host_stats['reused']} reused"
+        )
+
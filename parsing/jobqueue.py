@@ -0,0 +1,215 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from .counters import scope
+from .pagination import record_key
+
+QUEUE_PATH = os.environ.get('PARSING_QUEUE_PATH', 'jobs.sqlite')
+VISIBILITY_TIMEOUT = 5 * 60  # Через сколько секунд невыполненное задание снова становится доступным
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 30  # Пауза перед повтором упавшего задания, в секундах
+POLL_INTERVAL = 1.0
+
+# Вид задания -> обработчик handler(queue, payload) -> список записей
+HANDLERS = {}
+
+
+def handler(kind):
+    """Регистрирует обработчик заданий вида kind."""
+    def register(func):
+        HANDLERS[kind] = func
+        return func
+    return register
+
+
+class JobQueue:
+    """
+    Постоянная очередь заданий в SQLite, общая для нескольких процессов-воркеров.
+
+    Воркер берет задание в аренду (lease) на время видимости; если он не подтвердил
+    выполнение (ack) за это время, задание снова выдается другому воркеру.
+    Записи выполненных заданий хранятся в очереди до объединения в один файл.
+    """
+
+    def __init__(self, path=QUEUE_PATH):
+        self.path = path
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'queued',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL DEFAULT 0,
+                leased_until REAL,
+                worker TEXT,
+                error TEXT,
+                UNIQUE (kind, payload)
+            );
+            CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, priority, id);
+            CREATE TABLE IF NOT EXISTS results (
+                output TEXT NOT NULL,
+                record_key BLOB NOT NULL,
+                job_id INTEGER NOT NULL,
+                record TEXT NOT NULL,
+                PRIMARY KEY (output, record_key)
+            );
+        """)
+
+    @contextmanager
+    def _transaction(self):
+        # BEGIN IMMEDIATE сразу берет блокировку записи, поэтому два воркера не получат одно задание
+        self._db.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self._db.execute('ROLLBACK')
+            raise
+        self._db.execute('COMMIT')
+
+    def enqueue(self, kind, payload, priority=0):
+        """Ставит задание в очередь; повторное задание с тем же kind и payload игнорируется."""
+        cursor = self._db.execute(
+            'INSERT OR IGNORE INTO jobs (kind, payload, priority) VALUES (?, ?, ?)',
+            (kind, json.dumps(payload, sort_keys=True, ensure_ascii=False), priority)
+        )
+        return cursor.rowcount > 0
+
+    def lease(self, worker, timeout=VISIBILITY_TIMEOUT):
+        """Берет в аренду следующее доступное задание: (id, kind, payload) или None."""
+        now = time.time()
+        with self._transaction():
+            # Аренда истекла после MAX_ATTEMPTS попыток: задание, скорее всего, роняет воркер, не повторяем его
+            self._db.execute("""
+                UPDATE jobs SET status = 'failed', leased_until = NULL, error = 'lease expired'
+                WHERE status = 'leased' AND leased_until < ? AND attempts >= ?
+            """, (now, MAX_ATTEMPTS))
+            row = self._db.execute("""
+                SELECT id, kind, payload FROM jobs
+                WHERE (status = 'queued' AND available_at <= ?) OR (status = 'leased' AND leased_until < ?)
+                ORDER BY priority DESC, id LIMIT 1
+            """, (now, now)).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE jobs SET status = 'leased', leased_until = ?, worker = ?, attempts = attempts + 1 WHERE id = ?",
+                (now + timeout, worker, row[0])
+            )
+        return row[0], row[1], json.loads(row[2])
+
+    def ack(self, job_id, worker, output, records):
+        """
+        Сохраняет записи задания (точные дубликаты отбрасываются) и отмечает его выполненным.
+
+        :return: False, если аренда воркера истекла и задание уже передано другому; записи тогда не сохраняются.
+        """
+        with self._transaction():
+            cursor = self._db.execute(
+                "UPDATE jobs SET status = 'done', leased_until = NULL WHERE id = ? AND worker = ? AND status = 'leased'",
+                (job_id, worker)
+            )
+            if not cursor.rowcount:
+                return False
+            self._db.executemany(
+                'INSERT OR IGNORE INTO results (output, record_key, job_id, record) VALUES (?, ?, ?, ?)',
+                [
+                    (output, record_key(record), job_id, json.dumps(record, ensure_ascii=False, default=str))
+                    for record in records
+                ]
+            )
+        return True
+
+    def fail(self, job_id, worker, error):
+        """Возвращает задание в очередь с паузой или, после MAX_ATTEMPTS попыток, помечает его failed."""
+        with self._transaction():
+            self._db.execute("""
+                UPDATE jobs SET
+                    status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END,
+                    available_at = ?, leased_until = NULL, error = ?
+                WHERE id = ? AND worker = ? AND status = 'leased'
+            """, (MAX_ATTEMPTS, time.time() + RETRY_DELAY, error, job_id, worker))
+
+    def has_records(self, output, records):
+        """True, если все записи уже сохранены для output (например, страница списка повторилась)."""
+        return all(
+            self._db.execute(
+                'SELECT 1 FROM results WHERE output = ? AND record_key = ?', (output, record_key(record))
+            ).fetchone()
+            for record in records
+        )
+
+    def reset(self):
+        """
+        Удаляет выполненные и упавшие задания и их записи, чтобы следующий обход начался заново.
+        Задания в очереди и в аренде остаются.
+
+        :return: Число удаленных заданий.
+        """
+        with self._transaction():
+            removed = self._db.execute("DELETE FROM jobs WHERE status IN ('done', 'failed')").rowcount
+            self._db.execute('DELETE FROM results WHERE job_id NOT IN (SELECT id FROM jobs)')
+        return removed
+
+    def pending(self):
+        """Сколько заданий еще не выполнено (в очереди или в аренде)."""
+        return self._db.execute("SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'leased')").fetchone()[0]
+
+    def stats(self):
+        return dict(self._db.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status'))
+
+    def outputs(self):
+        return [output for output, in self._db.execute('SELECT DISTINCT output FROM results ORDER BY output')]
+
+    def records(self, output):
+        """Записи output в порядке выполнения заданий."""
+        for record, in self._db.execute('SELECT record FROM results WHERE output = ? ORDER BY job_id, rowid', (output,)):
+            yield json.loads(record)
+
+    def close(self):
+        self._db.close()
+
+
+def run_worker(path=QUEUE_PATH, name=None, timeout=VISIBILITY_TIMEOUT):
+    """
+    Выполняет задания, пока в очереди есть невыполненные. Обработчики должны быть
+    зарегистрированы через handler() до запуска.
+
+    :return: Число выполненных заданий.
+    """
+    queue = JobQueue(path)
+    name = name or f'{socket.gethostname()}-{os.getpid()}'
+    done = 0
+    try:
+        while True:
+            job = queue.lease(name, timeout)
+            if job is None:
+                if not queue.pending():
+                    break
+                # Остальные задания в аренде у других воркеров или ждут повтора
+                time.sleep(POLL_INTERVAL)
+                continue
+
+            job_id, kind, payload = job
+            try:
+                with scope(kind):
+                    records = HANDLERS[kind](queue, payload)
+            except Exception as e:
+                logging.exception(f"Job {job_id} ({kind}) failed: {e}")
+                queue.fail(job_id, name, str(e))
+                continue
+            if not queue.ack(job_id, name, payload.get('output'), records or []):
+                logging.warning(f"Job {job_id} ({kind}): lease expired, result discarded")
+                continue
+            done += 1
+    finally:
+        queue.close()
+    logging.info(f"Worker {name} finished: {done} jobs")
+    return done
@@ -0,0 +1,196 @@
+import argparse
+import logging
+import multiprocessing
+from urllib.parse import urljoin
+
+from .browser import close_pool, render_page
+from .core import fetch_page, load_links_from_csv
+from .extractors import (
+    RESARTIS_DETAIL_SCHEMA,
+    RESARTIS_LABELS,
+    extract_artists_community_details,
+    extract_artrabbit_listing,
+    extract_callforentry_details,
+    extract_curatorspace_listing,
+    extract_resartis_cards,
+    extract_resartis_details,
+    extract_transartists_listing,
+    make_soup,
+)
+from .jobqueue import QUEUE_PATH, VISIBILITY_TIMEOUT, JobQueue, handler, run_worker
+from .pagination import PageNotFound
+from .ratelimit import share_limits
+from .sinks import open_sink
+from .sites import default_tasks
+from .tracing import log_report
+
+HEADERS = {'User-Agent': 'Mozilla/5.0'}
+
+# Страницы списков с нумерацией: сайт -> (экстрактор, номер первой страницы)
+PAGED_LISTINGS = {
+    'transartists': (extract_transartists_listing, 0),
+    'curatorspace': (extract_curatorspace_listing, 1),
+}
+
+# Парсер из main() -> первое задание для него
+TASK_JOBS = {
+    'parse_artist_opportunities': lambda task: ('artrabbit_listing', {}),
+    'parse_transartists': lambda task: ('listing_page', {'site': 'transartists', 'url': f"{task['url']}{{page}}"}),
+    'parse_curatorspace_opportunities': lambda task: ('listing_page', {'site': 'curatorspace', 'url': task['url']}),
+    'parse_resartis_opportunities': lambda task: ('resartis_listing', {}),
+    'parse_artists_communities': lambda task: ('artistcommunities_listing', {}),
+}
+
+
+def _fetch(url, raise_not_found=False):
+    html = fetch_page(url, HEADERS, raise_not_found)
+    if not html:
+        # Исключение возвращает задание в очередь для повтора
+        raise RuntimeError(f"Failed to fetch {url}")
+    return html
+
+
+@handler('artrabbit_listing')
+def artrabbit_listing(queue, job):
+    return extract_artrabbit_listing(_fetch(job['url']))
+
+
+@handler('listing_page')
+def listing_page(queue, job):
+    """Одна страница списка; следующая ставится в очередь, пока страницы приносят новые записи."""
+    extract, start = PAGED_LISTINGS[job['site']]
+    page = job.get('page', start)
+    try:
+        html = _fetch(job['url'].format(page=page), raise_not_found=page != start)
+    except PageNotFound:
+        # Номер за последней страницей: список закончился
+        return []
+    records = extract(html)
+    if records and not queue.has_records(job['output'], records):
+        queue.enqueue('listing_page', {**job, 'page': page + 1})
+    return records
+
+
+@handler('resartis_listing')
+def resartis_listing(queue, job):
+    for item in extract_resartis_cards(render_page(job['url'], wait_for_class='grid__item')):
+        if item['link']:
+            queue.enqueue('resartis_detail', {'url': item['link'], 'title': item['title'], 'output': job['output']})
+    return []
+
+
+@handler('resartis_detail')
+def resartis_detail(queue, job):
+    record = extract_resartis_details(_fetch(job['url']))
+    if record is None:
+        return []
+    record.pop('_unknown_labels')
+    # Порядок колонок как в parse_resartis_opportunities
+    record = {'title': job['title'], **record}
+    fieldnames = ['title', *RESARTIS_DETAIL_SCHEMA.fields, *RESARTIS_LABELS.values(), 'more_info_link']
+    return [{name: record.get(name) for name in fieldnames}]
+
+
+@handler('artistcommunities_listing')
+def artistcommunities_listing(queue, job):
+    soup = make_soup(_fetch(job['url']))
+    for link in soup.select('td.views-field-label a'):
+        queue.enqueue('artistcommunities_detail', {'url': urljoin(job['url'], link['href']), 'output': job['output']})
+    return []
+
+
+@handler('artistcommunities_detail')
+def artistcommunities_detail(queue, job):
+    record = extract_artists_community_details(_fetch(job['url']))
+    return [record] if record else []
+
+
+@handler('callforentry_detail')
+def callforentry_detail(queue, job):
+    record = extract_callforentry_details(_fetch(job['url']))
+    return [record] if record else []
+
+
+def enqueue_tasks(queue, tasks=None):
+    """Ставит в очередь первые задания всех парсеров из main(); возвращает число новых заданий."""
+    added = 0
+    for task in tasks or default_tasks():
+        kind, payload = TASK_JOBS[task['func'].__name__](task)
+        payload = {'url': task['url'], **payload, 'output': task['output']}
+        added += queue.enqueue(kind, payload, priority=task.get('priority', 0))
+    return added
+
+
+def enqueue_links(queue, file_path, output='artist_callforentry_12.csv'):
+    """Ставит в очередь страницы callforentry из файла ссылок (как parse_csv_file)."""
+    added = 0
+    for _, link in load_links_from_csv(file_path):
+        added += queue.enqueue('callforentry_detail', {'url': link, 'output': output})
+    return added
+
+
+def merge(queue, outputs=None):
+    """Объединяет записи всех воркеров в итоговые файлы."""
+    for output in outputs or queue.outputs():
+        with open_sink(output, dedup=True) as sink:
+            sink.write_many(queue.records(output))
+        logging.info(f"Merged {sink.written} records into {output}")
+
+
+def _worker_main(path, timeout):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    # Частоты запросов к хостам общие для всех воркеров очереди
+    share_limits(path)
+    try:
+        run_worker(path, timeout=timeout)
+    finally:
+        log_report()
+        close_pool()
+
+
+def run_workers(processes, path=QUEUE_PATH, timeout=VISIBILITY_TIMEOUT):
+    """Запускает processes воркеров и ждет, пока очередь опустеет."""
+    workers = [multiprocessing.Process(target=_worker_main, args=(path, timeout)) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Распределенный обход сайтов через общую очередь заданий.')
+    parser.add_argument('--queue', default=QUEUE_PATH, help='Файл очереди SQLite')
+    commands = parser.add_subparsers(dest='command', required=True)
+    enqueue = commands.add_parser('enqueue', help='Поставить в очередь задания парсеров')
+    enqueue.add_argument('--links', help='CSV со ссылками callforentry (колонка Link)')
+    worker = commands.add_parser('worker', help='Выполнять задания из очереди')
+    worker.add_argument('--processes', type=int, default=1)
+    worker.add_argument('--timeout', type=float, default=VISIBILITY_TIMEOUT, help='Время аренды задания, в секундах')
+    commands.add_parser('merge', help='Объединить записи в итоговые файлы')
+    commands.add_parser('reset', help='Удалить выполненные задания и их записи перед новым обходом')
+    commands.add_parser('status', help='Показать число заданий по статусам')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.command == 'worker':
+        run_workers(args.processes, args.queue, args.timeout)
+        return
+
+    queue = JobQueue(args.queue)
+    try:
+        if args.command == 'enqueue':
+            added = enqueue_links(queue, args.links) if args.links else enqueue_tasks(queue)
+            if not added:
+                # Те же задания уже выполнены в прошлом обходе
+                logging.warning(f"No new jobs in {args.queue}; run 'reset' to crawl again")
+        elif args.command == 'merge':
+            merge(queue)
+        elif args.command == 'reset':
+            logging.info(f"Removed {queue.reset()} finished jobs")
+        print(queue.stats())
+    finally:
+        queue.close()
+
+
+if __name__ == '__main__':
+    main()
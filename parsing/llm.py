@@ -0,0 +1,209 @@
+import hashlib
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import openai
+
+from .ratelimit import retry_after_seconds
+from .tracing import stage
+
+OPENAI_MODEL = os.environ.get('OPENAI_MODEL', 'gpt-4')
+LLM_CONCURRENCY = int(os.environ.get('PARSING_LLM_CONCURRENCY', 4))
+LLM_CACHE_PATH = os.environ.get('PARSING_LLM_CACHE', 'llm_cache.sqlite')
+LLM_MAX_TOKENS = 3000
+MAX_RETRIES = 5
+
+# Поля, которые модель заполняет для каждой строки, и инструкции к ним
+OPEN_CALL_FIELDS = {
+    'City_Country': 'Верни на английском языке ТОЛЬКО страну, если указано.',
+    'Open_Call_Title': 'Верни на английском языке ТОЛЬКО название опен-колла.',
+    'Deadline_Date': 'Верни на английском языке ТОЛЬКО дату дедлайна в формате YYYY-MM-DD.',
+    'Event_Date': 'Верни на английском языке ТОЛЬКО дату мероприятия.',
+    'Application_Form_Link': 'Верни на английском языке ТОЛЬКО ссылку на форму заявки.',
+    'Selection_Criteria': 'Верни на английском языке ТОЛЬКО критерии отбора.',
+    'Fee': 'Верни на английском языке ТОЛЬКО стоимость участия.',
+    'FAQ': 'Составь FAQ для опен-колла.',
+    'Application_Guide': 'Составь подробный план подачи заявки.',
+}
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Клиент OpenAI; ключ и адрес API берутся из OPENAI_API_KEY и OPENAI_BASE_URL при
+    создании клиента (адрес позволяет подставить локальный мок).
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            # Повторы выполняет _create_with_retry, встроенные отключены
+            _client = openai.OpenAI(api_key=os.environ.get('OPENAI_API_KEY', 'KEY'), max_retries=0)
+        return _client
+
+
+class PromptCache:
+    """Постоянный кэш ответов модели по хэшу запроса."""
+
+    def __init__(self, path=LLM_CACHE_PATH):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('CREATE TABLE IF NOT EXISTS responses (prompt_hash TEXT PRIMARY KEY, response TEXT NOT NULL)')
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute('SELECT response FROM responses WHERE prompt_hash = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key, value):
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO responses (prompt_hash, response) VALUES (?, ?)',
+                (key, json.dumps(value, ensure_ascii=False))
+            )
+            self._db.commit()
+
+
+def prompt_hash(request):
+    """Хэш запроса к модели (модель, сообщения, схема ответа)."""
+    return hashlib.sha256(json.dumps(request, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def _retry_delay(error, attempt):
+    """Пауза перед повтором: Retry-After от сервера или экспоненциальная с разбросом."""
+    response = getattr(error, 'response', None)
+    retry_after = retry_after_seconds(response.headers.get('retry-after')) if response is not None else None
+    return retry_after if retry_after is not None else min(2 ** attempt, 60) + random.uniform(0, 1)
+
+
+def _create_with_retry(request):
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            with stage('llm'):
+                return get_client().chat.completions.create(**request)
+        except RETRYABLE_ERRORS as e:
+            if attempt == MAX_RETRIES:
+                raise
+            delay = _retry_delay(e, attempt)
+            logging.warning(f"OpenAI request failed ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def build_request(row, fields=OPEN_CALL_FIELDS):
+    """Один запрос со структурированным ответом, который заполняет все поля строки."""
+    data = " ".join([f"{col}: {str(value)}" for col, value in row.items()])
+    return {
+        'model': OPENAI_MODEL,
+        'messages': [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": f"Заполни поля опен-колла по данным. Данные: {data}"},
+        ],
+        'tools': [{
+            'type': 'function',
+            'function': {
+                'name': 'save_open_call',
+                'parameters': {
+                    'type': 'object',
+                    'properties': {name: {'type': 'string', 'description': hint} for name, hint in fields.items()},
+                    'required': list(fields),
+                },
+            },
+        }],
+        'tool_choice': {'type': 'function', 'function': {'name': 'save_open_call'}},
+        'max_tokens': LLM_MAX_TOKENS,
+        # Ответы кэшируются по хэшу запроса, поэтому нужен воспроизводимый, а не случайный ответ
+        'temperature': 0,
+    }
+
+
+def normalize_row(row, cache, fields=OPEN_CALL_FIELDS):
+    """
+    Заполняет поля строки одним запросом к модели.
+
+    :return: (словарь полей, статистика запроса: tokens, latency, cached).
+    """
+    request = build_request(row, fields)
+    key = prompt_hash(request)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached, {'tokens': 0, 'latency': 0.0, 'cached': True}
+
+    started = time.perf_counter()
+    response = _create_with_retry(request)
+    latency = time.perf_counter() - started
+
+    arguments = json.loads(response.choices[0].message.tool_calls[0].function.arguments)
+    result = {name: str(arguments.get(name, '')).strip() for name in fields}
+    cache.put(key, result)
+
+    tokens = response.usage.total_tokens if response.usage else 0
+    return result, {'tokens': tokens, 'latency': latency, 'cached': False}
+
+
+def normalize_rows(rows, concurrency=LLM_CONCURRENCY, cache=None, fields_for=None):
+    """
+    Параллельно нормализует строки через модель.
+
+    :param rows: Итератор словарей-строк.
+    :param fields_for: Необязательная функция fields_for(row) -> поля, которые нужно запросить
+                       у модели (по умолчанию все OPEN_CALL_FIELDS); без полей запрос не делается.
+    :return: Генератор пар (строка, словарь полей или None при ошибке) по мере готовности.
+    """
+    cache = cache or PromptCache()
+    totals = {'rows': 0, 'tokens': 0, 'cached': 0, 'failed': 0}
+
+    def process(index, row):
+        fields = fields_for(row) if fields_for else OPEN_CALL_FIELDS
+        if not fields:
+            return {}, {'tokens': 0, 'latency': 0.0, 'cached': False}
+        try:
+            result, stats = normalize_row(row, cache, fields)
+        except Exception as e:
+            logging.error(f"Ошибка при обращении к OpenAI для строки {index}: {e}")
+            return None, None
+        logging.info(
+            f"Row {index}: {stats['tokens']} tokens, {stats['latency']:.2f}s{' (cached)' if stats['cached'] else ''}"
+        )
+        return result, stats
+
+    def collect(done):
+        for future in done:
+            row = pending.pop(future)
+            result, stats = future.result()
+            totals['rows'] += 1
+            if stats is None:
+                totals['failed'] += 1
+            else:
+                totals['tokens'] += stats['tokens']
+                totals['cached'] += stats['cached']
+            yield row, result
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = {}
+        for index, row in enumerate(rows):
+            pending[executor.submit(process, index, row)] = row
+            if len(pending) >= concurrency * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from collect(done)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            yield from collect(done)
+
+    logging.info(
+        f"LLM normalization: {totals['rows']} rows, {totals['tokens']} tokens, "
+        f"{totals['cached']} from cache, {totals['failed']} failed"
+    )
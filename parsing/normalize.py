@@ -0,0 +1,265 @@
+import logging
+import re
+
+DEFAULT_CHUNK_SIZE = 200
+
+# Поле open call -> колонки источников, из которых его можно получить без модели (по приоритету)
+SOURCE_COLUMNS = {
+    'Open_Call_Title': ['Open_Call_Title', 'Title', 'title'],
+    'City_Country': ['City_Country', 'Country of Residence', 'country', 'location', 'Location Info'],
+    'Deadline_Date': ['Deadline_Date', 'Deadline', 'deadline', 'application_deadline'],
+    'Event_Date': ['Event_Date', 'event_date', 'residency_starts'],
+    'Application_Form_Link': ['Application_Form_Link', 'Application URL', 'more_info_link', 'contact_links', 'URL', 'Link', 'Website'],
+    'Fee': ['Fee', 'Residency Fees', 'entry_fee', 'fee_detail', 'fees'],
+}
+
+# Значения-заглушки парсеров, которые считаются отсутствующими
+MISSING_VALUES = ['', 'No data', 'N/A', 'No description', 'No title', 'nan', 'None']
+
+COUNTRIES = [
+    'Afghanistan', 'Albania', 'Algeria', 'Andorra', 'Angola', 'Argentina', 'Armenia', 'Australia', 'Austria',
+    'Azerbaijan', 'Bahamas', 'Bahrain', 'Bangladesh', 'Barbados', 'Belarus', 'Belgium', 'Belize', 'Benin',
+    'Bhutan', 'Bolivia', 'Bosnia and Herzegovina', 'Botswana', 'Brazil', 'Brunei', 'Bulgaria', 'Burkina Faso',
+    'Burundi', 'Cambodia', 'Cameroon', 'Canada', 'Cape Verde', 'Chad', 'Chile', 'China', 'Colombia', 'Comoros',
+    'Costa Rica', 'Croatia', 'Cuba', 'Cyprus', 'Czech Republic', 'Denmark', 'Djibouti', 'Dominican Republic',
+    'Ecuador', 'Egypt', 'El Salvador', 'Estonia', 'Eswatini', 'Ethiopia', 'Fiji', 'Finland', 'France', 'Gabon',
+    'Gambia', 'Georgia', 'Germany', 'Ghana', 'Greece', 'Greenland', 'Guatemala', 'Guinea', 'Guinea-Bissau', 'Guyana',
+    'Haiti',
+    'Honduras', 'Hong Kong', 'Hungary', 'Iceland', 'India', 'Indonesia', 'Iran', 'Iraq', 'Ireland', 'Israel',
+    'Italy', 'Ivory Coast', 'Jamaica', 'Japan', 'Jordan', 'Kazakhstan', 'Kenya', 'Kosovo', 'Kuwait', 'Kyrgyzstan',
+    'Laos', 'Latvia', 'Lebanon', 'Lesotho', 'Liberia', 'Libya', 'Liechtenstein', 'Lithuania', 'Luxembourg',
+    'Madagascar', 'Malawi', 'Malaysia', 'Maldives', 'Mali', 'Malta', 'Mauritania', 'Mauritius', 'Mexico',
+    'Moldova', 'Monaco', 'Mongolia', 'Montenegro', 'Morocco', 'Mozambique', 'Myanmar', 'Namibia', 'Nepal',
+    'Netherlands', 'New Zealand', 'Nicaragua', 'Niger', 'Nigeria', 'North Macedonia', 'Norway', 'Oman',
+    'Pakistan', 'Palestine', 'Panama', 'Papua New Guinea', 'Paraguay', 'Peru', 'Philippines', 'Poland',
+    'Portugal', 'Puerto Rico', 'Qatar', 'Romania', 'Russia', 'Rwanda', 'Saudi Arabia', 'Senegal', 'Serbia',
+    'Sierra Leone', 'Singapore', 'Slovakia', 'Slovenia', 'Somalia', 'South Africa', 'South Korea', 'South Sudan',
+    'Spain', 'Sri Lanka', 'Sudan', 'Suriname', 'Sweden', 'Switzerland', 'Syria', 'Taiwan', 'Tajikistan',
+    'Tanzania', 'Thailand', 'Togo', 'Trinidad and Tobago', 'Tunisia', 'Turkey', 'Turkmenistan', 'Uganda',
+    'Ukraine', 'United Arab Emirates', 'United Kingdom', 'United States', 'Uruguay', 'Uzbekistan', 'Venezuela',
+    'Vietnam', 'Yemen', 'Zambia', 'Zimbabwe',
+]
+
+COUNTRY_ALIASES = {
+    'usa': 'United States', 'u.s.a.': 'United States', 'u.s.': 'United States',
+    'united states of america': 'United States',
+    'uk': 'United Kingdom', 'u.k.': 'United Kingdom', 'great britain': 'United Kingdom', 'britain': 'United Kingdom',
+    'england': 'United Kingdom', 'scotland': 'United Kingdom', 'wales': 'United Kingdom',
+    'northern ireland': 'United Kingdom',
+    'holland': 'Netherlands', 'the netherlands': 'Netherlands', 'czechia': 'Czech Republic',
+    'korea': 'South Korea', 'republic of korea': 'South Korea', "cote d'ivoire": 'Ivory Coast',
+    'uae': 'United Arab Emirates', 'türkiye': 'Turkey', 'turkiye': 'Turkey', 'russian federation': 'Russia',
+    'macedonia': 'North Macedonia', 'swaziland': 'Eswatini', 'burma': 'Myanmar', 'deutschland': 'Germany',
+    'españa': 'Spain', 'italia': 'Italy', 'méxico': 'Mexico',
+}
+
+# Страны, совпадающие с названиями штатов США ("Atlanta, Georgia"): сами по себе страну не определяют
+US_STATE_COUNTRIES = {'Georgia'}
+# Страны, совпадающие с личными именами ("Chad Smith"): принимаются, только если стоят в конце адреса
+NAME_COUNTRIES = {'Chad', 'Jordan'}
+
+_COUNTRY_NAMES = {name.lower(): name for name in COUNTRIES}
+_COUNTRY_NAMES.update(COUNTRY_ALIASES)
+# Длинные названия раньше коротких: "South Sudan" не должен находиться как "Sudan";
+# часть составного названия ("Guinea-Bissau") и "New Mexico", "New Guinea" и т.п. - не страны
+_COUNTRY_ALTERNATIVES = '|'.join(re.escape(name) for name in sorted(_COUNTRY_NAMES, key=len, reverse=True))
+_COUNTRY_PATTERN = rf'(?<![\w.-])(?<!new )({_COUNTRY_ALTERNATIVES})(?![\w-])'
+# Страна - последняя часть адреса: "Berlin, Germany"
+_COUNTRY_AT_END = rf'(?:^|,)\s*(?:{_COUNTRY_ALTERNATIVES})[\s.,;:)]*$'
+
+_MONTHS = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?'
+_DATE_PATTERN = (
+    r'(\d{4}-\d{1,2}-\d{1,2}'
+    r'|\d{1,2}[./]\d{1,2}[./]\d{2,4}'
+    rf'|\d{{1,2}}(?:st|nd|rd|th)?\s+{_MONTHS},?\s+\d{{4}}'
+    rf'|{_MONTHS}\s+\d{{1,2}}(?:st|nd|rd|th)?,?\s+\d{{4}})'
+)
+# Форматы после приведения месяца к трем буквам и удаления суффиксов и запятых
+DATE_FORMATS = ['%Y-%m-%d', '%d %b %Y', '%b %d %Y', '%d.%m.%Y', '%d/%m/%Y', '%m/%d/%Y', '%d.%m.%y', '%d/%m/%y']
+# 03/04/2025 - 3 апреля или 4 марта в зависимости от страны: такие даты оставляем модели
+_AMBIGUOUS_DATE = r'^(?:0?[1-9]|1[0-2])/(?:0?[1-9]|1[0-2])/'
+
+CURRENCIES = {
+    '€': 'EUR', '£': 'GBP', '¥': 'JPY', '$': 'USD', 'us$': 'USD', 'ca$': 'CAD', 'c$': 'CAD', 'au$': 'AUD',
+    'a$': 'AUD', 'nz$': 'NZD', 'eur': 'EUR', 'euro': 'EUR', 'euros': 'EUR', 'usd': 'USD', 'gbp': 'GBP',
+    'cad': 'CAD', 'aud': 'AUD', 'nzd': 'NZD', 'chf': 'CHF', 'sek': 'SEK', 'nok': 'NOK', 'dkk': 'DKK',
+    'jpy': 'JPY', 'pln': 'PLN', 'czk': 'CZK',
+}
+_SYMBOLS = r'(?:us|ca|c|au|a|nz)?\$|€|£|¥'
+_CODES = r'eur(?:os?)?|usd|gbp|cad|aud|nzd|chf|sek|nok|dkk|jpy|pln|czk'
+_AMOUNT = r'\d[\d,]*(?:\.\d+)?'
+
+# Взнос за участие называется так; просто "fee" часто означает гонорар художнику ("$500 artist fee")
+_FEE_WORDS = r'(?:application|entry|submission|registration|participation|processing|non-refundable)\s+fees?\b'
+# Слова о деньгах, которые получает художник: сумма после них - не взнос
+_PAID_TO_ARTIST = r'receiv|stipend|honorari|paid|grant|award|budget|artist'
+
+
+def _money(suffix):
+    return (
+        rf'(?P<symbol{suffix}>{_SYMBOLS})\s?(?P<amount1{suffix}>{_AMOUNT})'
+        rf'|(?P<amount2{suffix}>{_AMOUNT})\s?(?P<code1{suffix}>{_CODES})\b'
+        rf'|\b(?P<code2{suffix}>{_CODES})\s?(?P<amount3{suffix}>{_AMOUNT})'
+    )
+
+
+# Сумма рядом со словом fee: "Fee: 25 EUR", "application fee (non-refundable): $25" или "$25 entry fee";
+# гонорар художнику ("artist fee: $500", "Fees and support: artists receive €500") и другие суммы
+# в тексте (стипендии) взносом не считаются
+_FEE_PATTERN = (
+    rf"(?<!artist )(?<!artists )(?<!artist's )(?<!artists' )\bfees?\b"
+    rf'(?:(?!{_PAID_TO_ARTIST})[^\d€£$¥.;\n]){{0,25}}?(?:{_money("_after")})'
+    rf'|(?:{_money("_before")})\s?{_FEE_WORDS}'
+)
+_NO_FEE_PATTERN = (
+    r'\b(?:no (?:application |entry |submission |participation )?fees?|free of charge|fee[- ]free|without (?:a )?fee'
+    r'|fees? (?:is |are )?waived|fees?:\s*(?:free|none))\b|^\s*(?:free|none|0)\s*$'
+)
+_URL_PATTERN = r'(https?://[^\s"\'<>()]+)'
+
+
+def _clean(series):
+    series = series.astype('string').str.strip()
+    return series.mask(series.isin(MISSING_VALUES))
+
+
+def first_value(frame, columns):
+    """Первое непустое значение из колонок columns для каждой строки."""
+    result = None
+    for column in columns:
+        if column not in frame:
+            continue
+        values = _clean(frame[column])
+        result = values if result is None else result.fillna(values)
+    return result
+
+
+def parse_dates(series):
+    """Ищет в тексте дату в одном из распространенных форматов и приводит ее к YYYY-MM-DD."""
+    import pandas as pd
+
+    text = (
+        series.str.extract(_DATE_PATTERN, flags=re.IGNORECASE, expand=False)
+        .str.lower()
+        .str.replace(r'(\d)(?:st|nd|rd|th)\b', r'\1', regex=True)
+        .str.replace(rf'\b({_MONTHS})', lambda match: match.group(1)[:3], regex=True)
+        .str.replace(',', ' ', regex=False)
+        .str.replace(r'\s+', ' ', regex=True)
+        .str.strip()
+    )
+    text = text.mask(text.str.contains(_AMBIGUOUS_DATE, regex=True, na=False) & (
+        text.str.extract(r'^(\d+)/(\d+)/', expand=True).astype('Float64').pipe(lambda parts: parts[0] != parts[1])
+    ))
+    result = pd.Series(pd.NaT, index=series.index, dtype='datetime64[ns]')
+    for date_format in DATE_FORMATS:
+        missing = result.isna() & text.notna()
+        if not missing.any():
+            break
+        result[missing] = pd.to_datetime(text[missing], format=date_format, errors='coerce')
+    return result.dt.strftime('%Y-%m-%d').astype('string')
+
+
+def parse_countries(series):
+    """
+    Находит в тексте страну по справочнику и возвращает ее английское название.
+
+    Берется последнее упоминание ("Atlanta, Georgia, USA" - United States). Если оно не
+    завершает адрес и в тексте названы разные страны, поле остается нераспознанным.
+    """
+    # Поиск слева направо: жадный префикс перед последним совпадением нашел бы "Sudan" в "South Sudan"
+    found = series.str.findall(_COUNTRY_PATTERN, flags=re.IGNORECASE)
+    last = found.str[-1].astype('string').str.lower()
+    countries = last.map(_COUNTRY_NAMES, na_action='ignore').astype('string')
+    at_end = series.str.contains(_COUNTRY_AT_END, flags=re.IGNORECASE, regex=True, na=False)
+    distinct = found.map(lambda names: len({_COUNTRY_NAMES[name.lower()] for name in names}), na_action='ignore')
+    single = (distinct == 1) & ~countries.isin(NAME_COUNTRIES)
+    return countries.where((at_end | single) & ~countries.isin(US_STATE_COUNTRIES))
+
+
+def parse_fees(series):
+    """Возвращает 'Free', если участие бесплатное, или сумму взноса с кодом валюты, например '25 EUR'."""
+    found = series.str.extract(_FEE_PATTERN, flags=re.IGNORECASE)
+
+    def first(*names):
+        result = found[f'{names[0]}_after']
+        for name in names:
+            for suffix in ('_after', '_before'):
+                result = result.fillna(found[name + suffix])
+        return result
+
+    currency = first('symbol', 'code1', 'code2').str.lower().map(CURRENCIES, na_action='ignore')
+    amount = first('amount1', 'amount2', 'amount3').str.replace(',', '', regex=False)
+    fees = (amount + ' ' + currency).astype('string')
+    free = series.str.contains(_NO_FEE_PATTERN, flags=re.IGNORECASE, regex=True, na=False)
+    return fees.mask(free, 'Free')
+
+
+def extract_urls(series):
+    """Первая ссылка http(s) в тексте."""
+    return series.str.extract(_URL_PATTERN, flags=re.IGNORECASE, expand=False).str.rstrip('.,;').astype('string')
+
+
+PARSERS = {
+    'City_Country': parse_countries,
+    'Deadline_Date': parse_dates,
+    'Event_Date': parse_dates,
+    'Application_Form_Link': extract_urls,
+    'Fee': parse_fees,
+}
+
+
+def resolve_fields(frame):
+    """
+    Заполняет поля open call из колонок источников без обращения к модели.
+
+    :param frame: DataFrame строк одного или нескольких источников.
+    :return: DataFrame с колонками SOURCE_COLUMNS; нераспознанные значения - NA.
+    """
+    import pandas as pd
+
+    resolved = pd.DataFrame(index=frame.index)
+    for field, columns in SOURCE_COLUMNS.items():
+        values = first_value(frame, columns)
+        if values is None:
+            resolved[field] = pd.Series(pd.NA, index=frame.index, dtype='string')
+            continue
+        parse = PARSERS.get(field)
+        resolved[field] = parse(values) if parse else values
+    return resolved
+
+
+def resolve_rows(rows, fields, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Пачками заполняет поля строк без модели.
+
+    :param fields: Все поля, которые нужны для строки (например, llm.OPEN_CALL_FIELDS).
+    :return: Генератор пар (строка, словарь распознанных полей).
+    """
+    import pandas as pd
+
+    totals = {'rows': 0, 'resolved': 0, 'complete': 0}
+
+    def process(chunk):
+        resolved = resolve_fields(pd.DataFrame.from_records(chunk))
+        for row, (_, values) in zip(chunk, resolved.iterrows()):
+            known = {name: value for name, value in values.items() if name in fields and not pd.isna(value)}
+            totals['rows'] += 1
+            totals['resolved'] += len(known)
+            totals['complete'] += len(known) == len(fields)
+            yield row, known
+
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield from process(chunk)
+            chunk = []
+    if chunk:
+        yield from process(chunk)
+
+    requested = totals['rows'] * len(fields)
+    share = totals['resolved'] / requested * 100 if requested else 0.0
+    logging.info(
+        f"Deterministic normalization: {totals['resolved']} of {requested} fields ({share:.0f}%) filled without LLM, "
+        f"{totals['complete']} of {totals['rows']} rows need no LLM call"
+    )
@@ -0,0 +1,86 @@
+import hashlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from urllib.parse import urljoin
+
+from .extractors import make_soup
+
+MAX_PAGES = 200  # Защита от бесконечного обхода
+
+
+class PageNotFound(Exception):
+    """Сервер ответил, что страницы нет (404/410): для списка с номерами страниц это его конец."""
+
+
+def record_key(record):
+    """Ключ записи для проверки, встречалась ли она на предыдущих страницах."""
+    return hashlib.blake2b(json.dumps(record, sort_keys=True, default=str).encode('utf-8'), digest_size=16).digest()
+
+
+def _next_link(html, url, selector):
+    link = make_soup(html).select_one(selector)
+    if link is None or not link.get('href'):
+        return None
+    return urljoin(url, link['href'])
+
+
+def paginate(page_url, fetch, extract, start=0, headers=None, next_selector=None, max_pages=MAX_PAGES):
+    """
+    Обходит страницы списка и выдает (url, записи страницы).
+
+    Следующая страница загружается в фоне, пока разбирается текущая. Обход
+    заканчивается, если страницы нет (fetch поднял PageNotFound), на ней нет
+    записей или все ее записи уже встречались (так сайты часто отвечают на номер
+    за последней страницей). Страница, которая не загрузилась (fetch вернул None
+    после своих повторов), или отсутствующая первая страница прерывают обход
+    с RuntimeError, чтобы задача считалась неудавшейся, а не молча теряла страницы.
+
+    :param page_url: Шаблон адреса страницы с {page} (номер начинается со start).
+    :param fetch: Функция загрузки (url, headers) -> HTML или None; для отсутствующей страницы
+                  поднимает PageNotFound.
+    :param extract: Функция HTML -> список записей.
+    :param next_selector: CSS-селектор ссылки на следующую страницу; если задан,
+                          обход идет по ссылкам, а не по номерам.
+    """
+    seen = set()
+
+    def submit(url):
+        # Копия контекста сохраняет область счетчиков вызывающей задачи
+        return executor.submit(copy_context().run, fetch, url, headers)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        url = page_url.format(page=start)
+        future = submit(url)
+        for page in range(start, start + max_pages):
+            try:
+                html = future.result()
+            except PageNotFound:
+                if page == start:
+                    raise RuntimeError(f"Pagination failed: first page {url} not found")
+                logging.info(f"Pagination stopped at {url}: page not found")
+                return
+            if not html:
+                raise RuntimeError(f"Pagination failed at {url}: page not available")
+
+            if next_selector:
+                next_url = _next_link(html, url, next_selector)
+            else:
+                next_url = page_url.format(page=page + 1)
+            future = submit(next_url) if next_url else None
+
+            records = extract(html)
+            keys = {record_key(record) for record in records}
+            if not keys - seen:
+                logging.info(f"Pagination stopped at {url}: no new records")
+                if future:
+                    future.cancel()
+                return
+            seen |= keys
+            yield url, records
+
+            if future is None:
+                return
+            url = next_url
+        logging.warning(f"Pagination stopped after {max_pages} pages at {url}")
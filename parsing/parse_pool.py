@@ -0,0 +1,90 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+
+from . import tracing
+
+# Число процессов для разбора HTML; 1 - разбор в текущем процессе
+PARSE_WORKERS = int(os.environ.get('PARSING_WORKERS', os.cpu_count() or 1))
+# Пул создается, когда уже работают потоки загрузки и планировщика: fork мог бы скопировать
+# захваченные ими блокировки, поэтому процессы запускаются через forkserver (или spawn)
+START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# Один пул процессов на процесс: парсеры, которые планировщик запускает параллельно, делят его
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context(START_METHOD)
+            )
+        return _pool
+
+
+def close_parse_pool():
+    """Останавливает общий пул процессов разбора (если он запускался)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def _safe_extract(extract, key, content):
+    try:
+        return extract(content)
+    except Exception as e:
+        logging.error(f"Error extracting {key}: {e}")
+        return None
+
+
+def _pool_extract(extract, key, content):
+    # Замеры этапов из процесса разбора возвращаются вместе с записью
+    return _safe_extract(extract, key, content), tracing.drain()
+
+
+def _collect(future):
+    record, histograms = future.result()
+    tracing.merge(histograms)
+    return record
+
+
+def parse_pages(extract, pages, workers=None):
+    """
+    Разбирает страницы функцией extract в общем пуле процессов.
+
+    :param extract: Функция уровня модуля extract(content) -> dict (должна сериализоваться pickle).
+    :param pages: Итератор пар (key, content) с сырыми байтами страниц.
+    :param workers: Сколько процессов пула может занять этот вызов (по умолчанию PARSE_WORKERS);
+                    1 - разбор в текущем процессе.
+    :return: Генератор пар (key, record) по мере готовности; record равен None при ошибке.
+    """
+    workers = min(workers or PARSE_WORKERS, PARSE_WORKERS)
+    if workers <= 1:
+        for key, content in pages:
+            yield key, _safe_extract(extract, key, content)
+        return
+
+    pool = _get_pool()
+    pending = {}
+    try:
+        for key, content in pages:
+            pending[pool.submit(_pool_extract, extract, key, content)] = key
+            # Не держим в очереди больше нескольких страниц на процесс
+            if len(pending) >= workers * 4:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), _collect(future)
+
+        for future in as_completed(pending):
+            yield pending[future], _collect(future)
+    finally:
+        # Пул общий: при раннем выходе отменяем только свои задания
+        for future in pending:
+            future.cancel()
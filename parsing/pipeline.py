@@ -0,0 +1,126 @@
+import os
+
+from .dedup import mark_duplicates
+from .streaming import Checkpoint, stream_rows
+from .tracing import export, log_report
+from .uploader import UploadLog, upload_row, upload_rows
+
+
+def ask_openai(question, prompt_prefix=""):
+    """Задает вопрос OpenAI и возвращает ответ."""
+    from .llm import get_client
+
+    prompt = f"{prompt_prefix}\n\nQuestion: {question}\nAnswer:"
+    try:
+        response = get_client().chat.completions.create(
+            model="gpt-4",
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant."},
+                {"role": "user", "content": prompt},
+            ],
+            max_tokens=4000,
+            temperature=1
+        )
+        return response.choices[0].message.content.strip()
+    except Exception as e:
+        print(f"Ошибка при обращении к OpenAI: {e}")
+        return "Error"
+
+
+def send_post_request(row):
+    """Отправляет POST-запрос на указанный URL с данными из строки файла."""
+    return upload_row(row, UploadLog())
+
+def process_csv_and_send_requests(file_path):
+    """
+    Читает файл (CSV, Parquet или Arrow), обрабатывает данные и отправляет POST-запросы по каждой строке.
+    Строки читаются потоково пачками; прерванная обработка продолжается с контрольной точки.
+    """
+    from .llm import OPEN_CALL_FIELDS, normalize_rows
+    from .normalize import resolve_rows
+
+    if not os.path.exists(file_path):
+        print(f"Ошибка при загрузке файла {file_path}: файл не найден")
+        return
+
+    checkpoint = Checkpoint(file_path)
+    if checkpoint.start:
+        print(f"Продолжаем обработку {file_path} со строки {checkpoint.start}.")
+    # Строки завершаются не по порядку: номер строки ищется по id объекта строки
+    in_flight = {}
+
+    def input_rows():
+        for index, row in stream_rows(file_path, checkpoint=checkpoint):
+            in_flight[id(row)] = index, row
+            yield row
+
+    def finish(row, *_):
+        checkpoint.done(in_flight.pop(id(row))[0])
+
+    # Open call, уже встречавшийся на другом сайте или в прошлых запусках, не отправляем повторно
+    def unique_rows():
+        for row, original in mark_duplicates(input_rows(), source=file_path, position=lambda row: in_flight[id(row)][0]):
+            if original is None:
+                yield row
+            else:
+                finish(row)
+
+    # Даты, страну, взнос и ссылку по возможности распознаем без модели
+    known = {}
+
+    def resolved_rows():
+        for row, fields in resolve_rows(unique_rows(), OPEN_CALL_FIELDS):
+            known[id(row)] = fields
+            yield row
+
+    def missing_fields(row):
+        return {name: hint for name, hint in OPEN_CALL_FIELDS.items() if name not in known[id(row)]}
+
+    # Одна структурированная заявка к модели на строку (только по нераспознанным полям), строки обрабатываются параллельно
+    results = []
+
+    def processed_rows():
+        for row, processed_data in normalize_rows(resolved_rows(), fields_for=missing_fields):
+            fields = known.pop(id(row))
+            if processed_data is None:
+                finish(row)
+                continue
+            processed_data = {name: fields.get(name, processed_data.get(name, '')) for name in OPEN_CALL_FIELDS}
+            # Дальше строку представляет ответ модели
+            in_flight[id(processed_data)] = in_flight.pop(id(row))[0], processed_data
+            results.append(processed_data)
+            yield processed_data
+
+    # Отправка данных на удаленный сервер по мере готовности строк
+    try:
+        upload_rows(processed_rows(), on_done=finish)
+    finally:
+        checkpoint.save()
+    if not in_flight:
+        checkpoint.finish()
+    return results
+
+def save_results(results, output_file):
+    """Сохраняет результаты в CSV файл."""
+    import pandas as pd
+
+    try:
+        df_results = pd.DataFrame(results)
+        df_results.to_csv(output_file, index=False, encoding='utf-8-sig')
+        print(f"Результаты успешно сохранены в {output_file}")
+    except Exception as e:
+        print(f"Ошибка при сохранении файла: {e}")
+
+def main_process(file_path):
+    """Основной процесс обработки CSV и отправки данных."""
+    try:
+        results = process_csv_and_send_requests(file_path)
+        if results:
+            save_results(results, '/content/drive/MyDrive/open_calls_ready_2/results.csv')
+        else:
+            print("Нет данных для сохранения.")
+    except Exception as e:
+        print(f"Ошибка в процессе выполнения: {e}")
+    finally:
+        log_report()
+        export()
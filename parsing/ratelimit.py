@@ -0,0 +1,175 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+DEFAULT_RATE = float(os.environ.get('PARSING_HOST_RATE', 1.0))  # Начальная частота запросов к хосту, в секунду
+MIN_RATE = 0.05
+MAX_RATE = float(os.environ.get('PARSING_HOST_MAX_RATE', 8.0))
+RATE_STEP = 0.1  # Прибавка к частоте после SUCCESS_WINDOW успешных ответов подряд
+SUCCESS_WINDOW = 20
+THROTTLE_STATUSES = {429, 503}
+
+
+def retry_after_seconds(value):
+    """Разбирает заголовок Retry-After (секунды или HTTP-дата); None, если разобрать нельзя."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Адаптивный лимитер запросов к одному хосту. Частота растет на RATE_STEP после
+    каждых SUCCESS_WINDOW успешных ответов подряд и уменьшается вдвое после 429/503;
+    Retry-After приостанавливает все запросы к хосту на указанное время, после паузы
+    запросы снова идут по одному с интервалом 1 / rate.
+    """
+
+    _clock = time.monotonic
+
+    def __init__(self, rate=DEFAULT_RATE, min_rate=MIN_RATE, max_rate=MAX_RATE):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self._lock = threading.Lock()
+        self._tokens = 1.0
+        # Время, с которого копятся токены; во время паузы оно в будущем
+        self._updated = self._clock()
+        self._successes = 0
+
+    @contextmanager
+    def _state(self):
+        with self._lock:
+            yield
+
+    def _refill(self, now):
+        if now <= self._updated:
+            return
+        # Запас не больше одной секунды запросов, чтобы не было всплесков после простоя
+        capacity = max(1.0, self.rate)
+        self._tokens = min(capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self):
+        """Забирает токен и возвращает, сколько секунд ждать до запроса."""
+        with self._state():
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1
+            # Без токенов запрос ставится в очередь за предыдущими: долг гасится со скоростью rate
+            wait = max(0.0, self._updated - now)
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            return wait
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def on_success(self):
+        with self._state():
+            self._successes += 1
+            if self._successes >= SUCCESS_WINDOW:
+                self._successes = 0
+                self.rate = min(self.max_rate, self.rate + RATE_STEP)
+
+    def on_throttle(self, retry_after=None):
+        with self._state():
+            now = self._clock()
+            self._refill(now)
+            self._successes = 0
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after and now + retry_after > self._updated:
+                # Токены начнут копиться только после паузы, ранее занятые отменяются
+                self._updated = now + retry_after
+                self._tokens = 1.0
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Лимитер хоста, общий для нескольких процессов: состояние (частота, токены, время)
+    хранится в таблице host_rates файла SQLite и меняется в транзакции при каждом
+    обращении, поэтому N процессов вместе не превышают частоту одного лимитера.
+    """
+
+    # Время должно быть общим для процессов
+    _clock = time.time
+
+    def __init__(self, host, path, **kwargs):
+        super().__init__(**kwargs)
+        self.host = host
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS host_rates (
+                host TEXT PRIMARY KEY,
+                rate REAL NOT NULL,
+                tokens REAL NOT NULL,
+                updated REAL NOT NULL,
+                successes INTEGER NOT NULL
+            )
+        """)
+        self._db.execute(
+            'INSERT OR IGNORE INTO host_rates VALUES (?, ?, ?, ?, ?)',
+            (host, self.rate, self._tokens, self._updated, self._successes)
+        )
+
+    @contextmanager
+    def _state(self):
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                self.rate, self._tokens, self._updated, self._successes = self._db.execute(
+                    'SELECT rate, tokens, updated, successes FROM host_rates WHERE host = ?', (self.host,)
+                ).fetchone()
+                yield
+                self._db.execute(
+                    'UPDATE host_rates SET rate = ?, tokens = ?, updated = ?, successes = ? WHERE host = ?',
+                    (self.rate, self._tokens, self._updated, self._successes, self.host)
+                )
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+            self._db.execute('COMMIT')
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+_shared_path = None
+
+
+def share_limits(path):
+    """Делит лимиты хостов между процессами через файл SQLite path (например, файл очереди заданий)."""
+    global _shared_path
+    with _limiters_lock:
+        _shared_path = path
+        _limiters.clear()
+
+
+def get_limiter(host):
+    """Возвращает общий для всех загрузок лимитер хоста."""
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = TokenBucket() if _shared_path is None else SharedTokenBucket(host, _shared_path)
+            _limiters[host] = limiter
+        return limiter
+
+
+def log_rates():
+    """Пишет в лог итоговые частоты запросов по хостам."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    for host, limiter in sorted(limiters.items()):
+        logging.info(f"Rate limit for {host}: {limiter.rate:.2f} req/s")
@@ -0,0 +1,164 @@
+import csv
+import os
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Колонки с часто повторяющимися значениями (страны, дисциплины, да/нет, сроки);
+# в Arrow и Parquet они хранятся со словарным кодированием
+DICTIONARY_COLUMNS = {
+    'Date',
+    'Deadline',
+    'Deadline_Date',
+    'City_Country',
+    'Location Info',
+    'Country of Residence',
+    'Disciplines',
+    'Languages',
+    'Stage of Career',
+    'Residency Length',
+    'Collaborative Residency',
+    'Companions',
+    'Family Friendly',
+    'Accessible Housing',
+    'Meals Provided',
+    'Type of Housing',
+    'Studios/Facilities Accessibility',
+    'Average Number of Artists',
+    'Number of Artists Accepted',
+    'Total Applicant Pool',
+    'Artist Stipend',
+    'Travel Stipend',
+    'Residency Fees',
+    'Fee',
+    'Language',
+}
+
+
+def arrow_schema(fieldnames):
+    """Arrow-схема записей источника: строки, для DICTIONARY_COLUMNS - словарь int32 -> строка."""
+    import pyarrow as pa
+
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([(name, dictionary if name in DICTIONARY_COLUMNS else pa.string()) for name in fieldnames])
+
+
+class DictionaryEncoder:
+    """
+    Словарь значений одной колонки, общий для всех пачек файла: новые значения
+    только дописываются в конец, поэтому в Arrow IPC пишутся лишь дельты словаря.
+    """
+
+    def __init__(self):
+        self._codes = {}
+
+    def encode(self, values):
+        import pyarrow as pa
+
+        codes = self._codes
+        indices = [None if value is None else codes.setdefault(value, len(codes)) for value in values]
+        return pa.DictionaryArray.from_arrays(pa.array(indices, pa.int32()), pa.array(list(codes), pa.string()))
+
+
+def record_batch(schema, rows, encoders):
+    """Собирает RecordBatch из списков значений; encoders - словарь колонка -> DictionaryEncoder."""
+    import pyarrow as pa
+
+    columns = []
+    for i, field in enumerate(schema):
+        values = [None if row[i] is None else str(row[i]) for row in rows]
+        if pa.types.is_dictionary(field.type):
+            columns.append(encoders.setdefault(field.name, DictionaryEncoder()).encode(values))
+        else:
+            columns.append(pa.array(values, pa.string()))
+    return pa.record_batch(columns, schema=schema)
+
+
+def _csv_rows(path, position, columns):
+    # Файл читается в двоичном режиме, чтобы знать смещение в байтах после каждой строки:
+    # csv.reader берет ровно столько физических строк, сколько занимает запись
+    with open(path, 'rb') as file:
+        offset = 0
+
+        def lines():
+            nonlocal offset
+            for line in file:
+                offset += len(line)
+                yield line.decode('utf-8')
+
+        reader = csv.reader(lines())
+        header = next(reader, None)
+        if header is None:
+            return
+        if header and header[0].startswith('\ufeff'):
+            header[0] = header[0][1:]
+        if position:
+            file.seek(position)
+            offset = position
+        for values in reader:
+            if not values:
+                continue
+            # Как csv.DictReader: недостающие поля - None, лишние значения - под ключом None
+            row = dict(zip(header, values))
+            if len(values) > len(header):
+                row[None] = values[len(header):]
+            for name in header[len(values):]:
+                row[name] = None
+            yield offset, {name: row[name] for name in columns} if columns else row
+
+
+def _arrow_rows(path, position, columns):
+    import pyarrow as pa
+
+    # Файл отображается в память: пачки читаются без копирования всего файла
+    reader = pa.ipc.open_file(pa.memory_map(path))
+    start_batch, start_row = position or (0, 0)
+    for i in range(start_batch, reader.num_record_batches):
+        batch = reader.get_batch(i)
+        rows = (batch.select(columns) if columns else batch).to_pylist()
+        for j in range(start_row if i == start_batch else 0, len(rows)):
+            yield [i, j + 1], rows[j]
+
+
+def _parquet_rows(path, position, columns, batch_size):
+    import pyarrow.parquet as pq
+
+    # Группы строк читаются независимо: продолжение начинается с нужной группы
+    file = pq.ParquetFile(path, memory_map=True)
+    start_group, start_row = position or (0, 0)
+    for group in range(start_group, file.num_row_groups):
+        index = 0
+        for batch in file.iter_batches(batch_size=batch_size, row_groups=[group], columns=columns):
+            for row in batch.to_pylist():
+                index += 1
+                if group != start_group or index > start_row:
+                    yield [group, index], row
+
+
+def iter_positioned_rows(path, position=None, columns=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Потоково читает записи из .arrow, .parquet или .csv и отдает пары (позиция, запись-словарь).
+
+    Позиция указывает на место в файле сразу после записи: смещение в байтах для CSV,
+    [номер пачки, строка в ней] для Arrow и [группа строк, строка в ней] для Parquet.
+    Переданная как position, она продолжает чтение с этого места без разбора
+    предыдущих записей. Для других расширений - ValueError.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        yield from _csv_rows(path, position, columns)
+    elif extension == '.arrow':
+        yield from _arrow_rows(path, position, columns)
+    elif extension == '.parquet':
+        yield from _parquet_rows(path, position, columns, batch_size)
+    else:
+        raise ValueError(f"Unsupported records format: {path}")
+
+
+def iter_rows(path, columns=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Потоково читает записи из .arrow, .parquet или .csv и отдает их словарями.
+    Arrow и Parquet читаются через отображение файла в память по пачкам; для других
+    расширений - ValueError.
+    """
+    for _, row in iter_positioned_rows(path, columns=columns, batch_size=batch_size):
+        yield row
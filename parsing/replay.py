@@ -0,0 +1,155 @@
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, unquote
+
+# record - сохранять загруженные страницы в архив, replay - отдавать отрисованные браузером страницы из архива
+REPLAY_MODE = os.environ.get('PARSING_REPLAY', '')
+FIXTURES_PATH = os.environ.get('PARSING_FIXTURES', 'fixtures')
+# Адрес replay-сервера; если задан, все запросы fetch_page идут на него
+REPLAY_URL = os.environ.get('PARSING_REPLAY_URL', '')
+
+
+class FixtureArchive:
+    """Архив записанных страниц: на каждый URL файл <sha256>.json с адресом и <sha256>.html.gz с телом."""
+
+    def __init__(self, path=FIXTURES_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    def _base(self, url):
+        return os.path.join(self.path, hashlib.sha256(url.encode('utf-8')).hexdigest())
+
+    def get(self, url):
+        """Возвращает записанное тело страницы или None."""
+        try:
+            with gzip.open(self._base(url) + '.html.gz', 'rb') as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, url, content):
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        base = self._base(url)
+        with self._lock:
+            with gzip.open(base + '.html.gz', 'wb') as file:
+                file.write(content)
+            with open(base + '.json', 'w', encoding='utf-8') as file:
+                json.dump({'url': url, 'recorded_at': time.time()}, file)
+
+    def urls(self):
+        """Список записанных URL."""
+        result = []
+        for name in sorted(os.listdir(self.path)):
+            if name.endswith('.json'):
+                with open(os.path.join(self.path, name), encoding='utf-8') as file:
+                    result.append(json.load(file)['url'])
+        return result
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_archive():
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = FixtureArchive()
+        return _archive
+
+
+def record_page(url, content):
+    """В режиме record сохраняет страницу в архив."""
+    if REPLAY_MODE == 'record':
+        get_archive().put(url, content)
+
+
+def replayed_page(url):
+    """В режиме replay возвращает страницу из архива (для страниц, которые отрисовывает браузер)."""
+    if REPLAY_MODE != 'replay':
+        return None
+    content = get_archive().get(url)
+    if content is None:
+        raise LookupError(f"{url} is not in the fixture archive {get_archive().path}")
+    return content.decode('utf-8')
+
+
+def replay_url(url, server_url=None):
+    """Адрес страницы на replay-сервере (или исходный адрес, если сервер не задан)."""
+    server_url = server_url or REPLAY_URL
+    if not server_url:
+        return url
+    return f"{server_url.rstrip('/')}/{quote(url, safe='')}"
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """Локальный HTTP-сервер, отдающий страницы из архива с заданной задержкой ответа."""
+
+    daemon_threads = True
+
+    def __init__(self, archive, latency=0.0, host='127.0.0.1', port=0):
+        self.archive = archive
+        self.latency = latency
+        super().__init__((host, port), _ReplayHandler)
+
+    @property
+    def url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def start(self):
+        """Запускает сервер в фоновом потоке."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        content = self.server.archive.get(unquote(self.path[1:]))
+        if content is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        logging.debug(f"replay: {format % args}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Replay-сервер записанных страниц. Запись: PARSING_REPLAY=record python -m parsing.'
+    )
+    parser.add_argument('fixtures', nargs='?', default=FIXTURES_PATH)
+    parser.add_argument('--latency', type=float, default=0.0, help='Задержка ответа, в секундах')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    server = ReplayServer(FixtureArchive(args.fixtures), latency=args.latency, port=args.port)
+    print(f"Replaying {args.fixtures} on {server.url} (set PARSING_REPLAY_URL={server.url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
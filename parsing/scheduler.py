@@ -0,0 +1,124 @@
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+from .counters import get_counters, scope
+from .http_cache import log_cache_stats
+
+DEFAULT_TASK_TIMEOUT = 30 * 60  # Предельное время работы одного парсера, в секундах
+
+
+def _task_name(task):
+    return task.get('name') or task['func'].__name__
+
+
+_status_lock = threading.Lock()
+
+
+def _finish(summary, status, **fields):
+    """Записывает итог задачи, если он еще не записан (задача, снятая по времени, остается 'timeout')."""
+    with _status_lock:
+        if summary['status'] != 'running':
+            return False
+        summary.update(status=status, wall=time.monotonic() - summary['started'], **fields)
+        return True
+
+
+def _run_task(task, summary, finished):
+    name = summary['name']
+    summary['started'] = time.monotonic()
+    summary['status'] = 'running'
+    logging.info(f"Starting {name}...")
+    try:
+        with scope(name):
+            task['func'](task['url'], task['output'])
+        if _finish(summary, 'ok'):
+            logging.info(f"Finished {name}. Data saved to {task['output']}")
+    except Exception as e:
+        _finish(summary, 'failed', error=str(e))
+        logging.exception(f"An error occurred in {name}: {e}")
+    finally:
+        log_cache_stats(name)
+        finished.set()
+
+
+def run_tasks(tasks, max_workers=None, timeout=DEFAULT_TASK_TIMEOUT):
+    """
+    Запускает парсеры параллельно.
+
+    Задачи стартуют в порядке убывания priority; две задачи одного хоста не работают
+    одновременно. Ошибка или превышение времени (task['timeout'] или timeout) в одной
+    задаче не останавливает остальные; хост задачи, снятой по времени, занят, пока ее
+    поток не завершится.
+
+    :param tasks: Список словарей с ключами func, url, output и необязательными priority, timeout, name.
+    :param max_workers: Сколько задач может работать одновременно (по умолчанию все).
+    :return: Список сводок по задачам: name, status, wall, pages, records.
+    """
+    max_workers = max_workers or len(tasks)
+    queue = sorted(tasks, key=lambda task: -task.get('priority', 0))
+    summaries = {_task_name(task): {'name': _task_name(task), 'status': 'pending', 'wall': 0.0} for task in tasks}
+    running = {}
+    # Задачи, снятые по времени: их потоки еще работают, и хост остается занятым, пока они не завершатся
+    timed_out = {}
+    blocked_since = None
+    finished = threading.Event()
+
+    while queue or running:
+        for thread in [thread for thread in timed_out if not thread.is_alive()]:
+            del timed_out[thread]
+        busy_hosts = {urlsplit(task['url']).netloc for task in (*running.values(), *timed_out.values())}
+        if queue and not running and all(urlsplit(task['url']).netloc in busy_hosts for task in queue):
+            # Остались только задачи хостов, занятых зависшими задачами: ждем их не дольше timeout
+            blocked_since = blocked_since or time.monotonic()
+            if time.monotonic() - blocked_since > timeout:
+                for task in queue:
+                    summaries[_task_name(task)]['status'] = 'skipped'
+                    logging.error(f"{_task_name(task)} skipped: its host is still busy with a timed out task")
+                break
+        else:
+            blocked_since = None
+        for task in list(queue):
+            if len(running) >= max_workers:
+                break
+            if urlsplit(task['url']).netloc in busy_hosts:
+                continue
+            queue.remove(task)
+            busy_hosts.add(urlsplit(task['url']).netloc)
+            summary = summaries[_task_name(task)]
+            # Поток-демон: зависший парсер не помешает завершить программу
+            thread = threading.Thread(target=_run_task, args=(task, summary, finished), daemon=True)
+            running[thread] = task
+            thread.start()
+
+        finished.wait(1)
+        finished.clear()
+
+        for thread, task in list(running.items()):
+            summary = summaries[_task_name(task)]
+            if not thread.is_alive():
+                del running[thread]
+            elif time.monotonic() - summary.get('started', time.monotonic()) > task.get('timeout', timeout):
+                if _finish(summary, 'timeout'):
+                    logging.error(f"{summary['name']} timed out after {summary['wall']:.0f}s, leaving it in background")
+                del running[thread]
+                timed_out[thread] = task
+
+    result = []
+    for summary in summaries.values():
+        counters = get_counters(summary['name'])
+        summary['pages'] = counters.get('pages', 0)
+        summary['records'] = counters.get('records', 0)
+        result.append(summary)
+    return result
+
+
+def log_summary(summaries):
+    """Пишет в лог итоговую таблицу по задачам."""
+    logging.info(f"{'task':<36}{'status':<10}{'wall, s':>10}{'pages':>8}{'records':>9}")
+    for summary in summaries:
+        logging.info(
+            f"{summary['name']:<36}{summary['status']:<10}{summary['wall']:>10.1f}"
+            f"{summary['pages']:>8}{summary['records']:>9}"
+        )
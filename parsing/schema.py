@@ -0,0 +1,137 @@
+import re
+
+import soupsieve
+from bs4 import Tag
+
+from .tracing import traced
+
+_COMBINATOR = re.compile(r'\s*[\s>+~]\s*')
+_CLASS = re.compile(r'\.((?:\\.|[\w-])+)')
+_TAG = re.compile(r'[a-zA-Z][\w-]*')
+
+
+def _anchor(selector):
+    """
+    Возвращает ('class', имя) или ('tag', имя) для последнего составного селектора,
+    чтобы при обходе дерева проверять поле только на подходящих элементах.
+    """
+    if ',' in selector:
+        return None
+    compound = _COMBINATOR.split(selector.strip())[-1]
+    classes = _CLASS.findall(compound)
+    if classes:
+        return 'class', re.sub(r'\\(.)', r'\1', classes[-1])
+    tag_match = _TAG.match(compound)
+    if tag_match:
+        return 'tag', tag_match.group(0).lower()
+    return None
+
+
+class Field:
+    """Описание одного поля схемы."""
+
+    def __init__(self, selector=None, attribute=None, many=False, separator=', ', text_separator='',
+                 default='N/A', convert=None):
+        """
+        :param selector: CSS-селектор; None - сам корневой элемент.
+        :param attribute: Атрибут для извлечения вместо текста (например, href).
+        :param many: Собрать все совпадения и склеить их через separator.
+        :param separator: Разделитель значений при many=True.
+        :param text_separator: Разделитель фрагментов текста внутри элемента.
+        :param default: Значение, если элемент не найден.
+        :param convert: Функция convert(element) -> значение вместо текста/атрибута.
+        """
+        self.selector = selector
+        self.attribute = attribute
+        self.many = many
+        self.separator = separator
+        self.text_separator = text_separator
+        self.default = default
+        self.convert = convert
+        self.compiled = soupsieve.compile(selector) if selector else None
+
+    def value(self, element):
+        """Значение поля для найденного элемента."""
+        if self.convert:
+            return self.convert(element)
+        if self.attribute:
+            return element.get(self.attribute, self.default)
+        return element.get_text(self.text_separator, strip=True)
+
+
+class Schema:
+    """
+    Набор полей сайта. Селекторы компилируются один раз, а все поля извлекаются
+    за один обход дерева документа.
+    """
+
+    def __init__(self, fields, require=None):
+        """
+        :param fields: Словарь имя поля -> Field (порядок задает порядок колонок).
+        :param require: Селектор элемента, без которого документ не обрабатывается.
+        """
+        self.fields = fields
+        self.require = soupsieve.compile(require) if require else None
+        self._by_class = {}
+        self._by_tag = {}
+        self._anywhere = []
+        for name, field in fields.items():
+            if field.compiled is None:
+                continue
+            anchor = _anchor(field.selector)
+            if anchor is None:
+                self._anywhere.append(name)
+            elif anchor[0] == 'class':
+                self._by_class.setdefault(anchor[1], []).append(name)
+            else:
+                self._by_tag.setdefault(anchor[1], []).append(name)
+
+    def _candidates(self, element):
+        names = list(self._anywhere)
+        names.extend(self._by_tag.get(element.name, ()))
+        for class_name in element.get('class', ()):
+            names.extend(self._by_class.get(class_name, ()))
+        return names
+
+    @traced('extract')
+    def extract(self, root):
+        """
+        Извлекает все поля из root (документа или элемента).
+
+        :return: Словарь значений или None, если нет обязательного элемента.
+        """
+        found = {}
+        many = {name: [] for name, field in self.fields.items() if field.many}
+        single_left = sum(1 for field in self.fields.values() if not field.many and field.compiled)
+        required_found = self.require is None
+
+        for element in root.descendants:
+            if not isinstance(element, Tag):
+                continue
+            if not required_found and self.require.match(element):
+                required_found = True
+            for name in self._candidates(element):
+                field = self.fields[name]
+                if name in found or not field.compiled.match(element):
+                    continue
+                if field.many:
+                    many[name].append(field.value(element))
+                else:
+                    found[name] = field.value(element)
+                    single_left -= 1
+            # Все одиночные поля найдены, а списочных нет - дальше обходить незачем
+            if required_found and not single_left and not many:
+                break
+
+        if not required_found:
+            return None
+
+        record = {}
+        for name, field in self.fields.items():
+            if field.compiled is None:
+                record[name] = field.value(root)
+            elif field.many:
+                record[name] = field.separator.join(many[name]) if many[name] else field.default
+            else:
+                record[name] = found.get(name, field.default)
+        return record
@@ -0,0 +1,219 @@
+import csv
+import hashlib
+import json
+import logging
+import os
+
+from .counters import incr
+from .records import arrow_schema, record_batch
+from .store import get_store, source_name
+from .tracing import stage
+
+DEFAULT_BATCH_SIZE = 100
+
+
+class RecordSink:
+    """
+    Потоковый приемник записей: пишет их пачками по мере поступления и при
+    dedup=True отбрасывает точные дубликаты по хэшу записи.
+    Записи - словари или списки значений в порядке fieldnames. При append=True
+    записи дописываются в существующий файл (для продолжения прерванной работы).
+    Если задан store (store.OpportunityStore), каждая пачка также добавляется в него.
+    """
+
+    def __init__(self, path, fieldnames=None, dedup=False, batch_size=DEFAULT_BATCH_SIZE, append=False, store=None):
+        self.path = path
+        self.append = append
+        self.store = store
+        self.fieldnames = list(fieldnames) if fieldnames else None
+        self.dedup = dedup
+        self.batch_size = batch_size
+        self.written = 0
+        self.duplicates = 0
+        self._seen = set()
+        self._batch = []
+
+    def _values(self, record):
+        if isinstance(record, dict):
+            return [record.get(name) for name in self.fieldnames]
+        return list(record)
+
+    def write(self, record):
+        """Добавляет запись; возвращает False, если это дубликат."""
+        if self.fieldnames is None:
+            if not isinstance(record, dict):
+                raise ValueError(f"fieldnames are required for list records in {self.path}")
+            self.fieldnames = list(record)
+        values = self._values(record)
+
+        if self.dedup:
+            key = hashlib.blake2b(json.dumps(values, default=str).encode('utf-8'), digest_size=16).digest()
+            if key in self._seen:
+                self.duplicates += 1
+                return False
+            self._seen.add(key)
+
+        self._batch.append(values)
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+        return True
+
+    def _store_batch(self, rows):
+        # Хранилище - дополнительная копия: его ошибка не должна прерывать запись файла
+        try:
+            self.store.add(source_name(self.path), [dict(zip(self.fieldnames, values)) for values in rows])
+        except Exception as e:
+            logging.error(f"Ошибка при записи {self.path} в хранилище: {e}")
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        """Сбрасывает накопленную пачку на диск."""
+        if not self._batch:
+            return
+        with stage('write'):
+            self._write_batch(self._batch)
+            if self.store is not None:
+                self._store_batch(self._batch)
+        self.written += len(self._batch)
+        incr('records', len(self._batch))
+        self._batch = []
+
+    def close(self):
+        self.flush()
+        self._close()
+        if not self.written:
+            logging.warning(f"Нет данных для сохранения в {self.path}.")
+        elif self.duplicates:
+            logging.info(f"Skipped {self.duplicates} duplicate records for {self.path}")
+
+    def _write_batch(self, rows):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class CsvSink(RecordSink):
+    """Пишет записи в CSV-файл."""
+
+    _file = None
+
+    def _write_batch(self, rows):
+        if self._file is None:
+            resume = self.append and os.path.exists(self.path) and os.path.getsize(self.path) > 0
+            self._file = open(self.path, mode='a' if resume else 'w', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._file)
+            if not resume:
+                self._writer.writerow(self.fieldnames)
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+class JsonLinesSink(RecordSink):
+    """Пишет записи в файл JSON Lines, по объекту на строку."""
+
+    _file = None
+
+    def _write_batch(self, rows):
+        if self._file is None:
+            self._file = open(self.path, mode='a' if self.append else 'w', encoding='utf-8')
+        for values in rows:
+            self._file.write(json.dumps(dict(zip(self.fieldnames, values)), ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+class ParquetSink(RecordSink):
+    """
+    Пишет записи в Parquet, по группе строк на пачку (нужен pyarrow).
+    Колонки из records.DICTIONARY_COLUMNS хранятся со словарным кодированием.
+    """
+
+    _writer = None
+
+    def __init__(self, path, fieldnames=None, dedup=False, batch_size=1000, append=False, store=None):
+        if append:
+            raise ValueError(f"{type(self).__name__} can't append to {path}")
+        super().__init__(path, fieldnames=fieldnames, dedup=dedup, batch_size=batch_size, store=store)
+        self._encoders = {}
+
+    def _write_batch(self, rows):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            self._schema = arrow_schema(self.fieldnames)
+            self._writer = pq.ParquetWriter(self.path, self._schema)
+        self._writer.write_table(pa.Table.from_batches([record_batch(self._schema, rows, self._encoders)]))
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class ArrowSink(RecordSink):
+    """
+    Пишет записи в файл Arrow IPC, по RecordBatch на пачку (нужен pyarrow).
+    Словари колонок растут от пачки к пачке и пишутся дельтами; файл читается
+    через records.iter_rows с отображением в память.
+    """
+
+    _writer = None
+
+    def __init__(self, path, fieldnames=None, dedup=False, batch_size=1000, append=False, store=None):
+        if append:
+            raise ValueError(f"{type(self).__name__} can't append to {path}")
+        super().__init__(path, fieldnames=fieldnames, dedup=dedup, batch_size=batch_size, store=store)
+        self._encoders = {}
+
+    def _write_batch(self, rows):
+        import pyarrow as pa
+
+        if self._writer is None:
+            self._schema = arrow_schema(self.fieldnames)
+            self._file = pa.OSFile(self.path, 'wb')
+            options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+            self._writer = pa.ipc.new_file(self._file, self._schema, options=options)
+        self._writer.write_batch(record_batch(self._schema, rows, self._encoders))
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._file.close()
+
+
+SINKS = {
+    '.csv': CsvSink,
+    '.jsonl': JsonLinesSink,
+    '.parquet': ParquetSink,
+    '.arrow': ArrowSink,
+}
+
+
+def open_sink(path, fieldnames=None, dedup=False, **kwargs):
+    """
+    Открывает приемник записей по расширению файла (.csv, .jsonl, .parquet, .arrow).
+    Записи также пишутся в общее хранилище store.get_store(), если оно не отключено.
+    """
+    if 'store' not in kwargs:
+        kwargs['store'] = get_store()
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SINKS:
+        raise ValueError(f"Unsupported output format: {path}")
+    return SINKS[extension](path, fieldnames=fieldnames, dedup=dedup, **kwargs)
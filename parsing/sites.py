@@ -0,0 +1,287 @@
+import logging
+from collections import Counter
+from functools import partial
+from urllib.parse import urljoin
+
+from .browser import close_pool, render_page
+from .core import fetch_page, load_links_from_csv
+from .crawl_state import CrawlState, content_hash
+from .extractors import (
+    ARTISTCOMMUNITIES_SCHEMA,
+    CALLFORENTRY_SCHEMA,
+    CURATORSPACE_SCHEMA,
+    RESARTIS_DETAIL_SCHEMA,
+    RESARTIS_LABELS,
+    TRANSARTISTS_SCHEMA,
+    extract_artists_community_details,
+    extract_artrabbit_listing,
+    extract_callforentry_details,
+    extract_curatorspace_listing,
+    extract_resartis_cards,
+    extract_resartis_details,
+    extract_transartists_listing,
+    make_soup,
+)
+from .fetcher import fetch_pages
+from .http_session import log_connection_stats
+from .pagination import paginate
+from .parse_pool import close_parse_pool, parse_pages
+from .ratelimit import log_rates
+from .scheduler import log_summary, run_tasks
+from .sinks import open_sink
+from .streaming import Checkpoint
+from .tracing import export, log_report
+
+
+def parse_csv_file(file_path):
+    """
+    Функция для парсинга конкретных данных по линкам из файла (данные могут быть изменены).
+    Ссылки читаются потоково; прерванный запуск продолжается с контрольной точки и дописывает результат.
+    """
+    checkpoint = Checkpoint(file_path)
+    if checkpoint.start:
+        logging.info(f"Resuming {file_path} from row {checkpoint.start}")
+    # Номера строк для каждой ссылки (ссылки в файле могут повторяться).
+    # links() читается fetch_pages в этом же потоке, поэтому блокировка не нужна
+    rows = {}
+
+    def links():
+        for index, link in load_links_from_csv(file_path, checkpoint):
+            rows.setdefault(link, []).append(index)
+            yield link
+
+    def finish(link):
+        checkpoint.done(rows[link].pop(0))
+
+    def fetched_pages():
+        for link, content in fetch_pages(links(), fetch_page):
+            if not content:
+                print(f"Ошибка при обработке ссылки {link}")
+                finish(link)
+                continue
+            yield link, content
+
+    output_file_path = 'artist_callforentry_12.csv'
+    with open_sink(output_file_path, fieldnames=CALLFORENTRY_SCHEMA.fields, append=bool(checkpoint.start)) as sink:
+        # Контрольная точка двигается только после сброса пачки записей на диск
+        written = []
+
+        def flush():
+            sink.flush()
+            for link in written:
+                finish(link)
+            written.clear()
+
+        try:
+            for link, record in parse_pages(extract_callforentry_details, fetched_pages()):
+                if record:
+                    sink.write(record)
+                written.append(link)
+                if len(written) >= sink.batch_size:
+                    flush()
+        finally:
+            flush()
+            checkpoint.save()
+    checkpoint.finish()
+
+
+def default_tasks():
+    """Задачи парсинга сайтов: функция, базовый URL, файл результата и приоритет."""
+    return [
+        {
+            "func": parse_artist_opportunities,
+            "url": "https://www.artrabbit.com/artist-opportunities/",
+            "output": "artist_opportunities.csv",
+            "priority": 1
+        },
+        {
+            "func": parse_transartists,
+            "url": "https://www.transartists.org/en/call-artists?page=",
+            "output": "transartists.csv",
+            "priority": 2
+        },
+        {
+            "func": parse_resartis_opportunities,
+            "url": "https://resartis.org/open-calls/",
+            "output": "resartis_opportunities.csv",
+            "priority": 3
+        },
+        {
+            "func": parse_curatorspace_opportunities,
+            "url": "https://www.curatorspace.com/opportunities?page={page}",
+            "output": "curatorspace.csv",
+            "priority": 2
+        },
+        {
+            "func": parse_artists_communities,
+            "url": "https://artistcommunities.org/directory/open-calls",
+            "output": "artist_communities.csv",
+            "priority": 4
+        },
+    ]
+
+
+def main():
+    """Основная функция для вызова всех парсеров."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    try:
+        tasks = default_tasks()
+
+        # Парсеры разных сайтов работают параллельно; долгие задачи стартуют первыми
+        log_summary(run_tasks(tasks))
+
+    except Exception as e:
+        logging.error(f"An error occurred during execution: {e}")
+    finally:
+        log_connection_stats()
+        log_rates()
+        log_report()
+        export()
+        # Закрываем браузеры Selenium и процессы разбора (если они запускались)
+        close_pool()
+        close_parse_pool()
+
+def parse_artist_opportunities(base_url, output_file):
+    """Парсинг сайта https://www.artrabbit.com/artist-opportunities/"""
+    html_content = fetch_page(base_url, headers={'User-Agent': 'Mozilla/5.0'})
+    if not html_content:
+        return []
+
+    with open_sink(output_file, dedup=True) as sink:
+        sink.write_many(extract_artrabbit_listing(html_content))
+    logging.info("Saved Artist opportunities to %s", output_file)
+
+
+def parse_transartists(base_url, output_file):
+    """Парсинг сайта https://www.transartists.org/en/call-artists?page="""
+    # Страницы нумеруются с нуля; обход идет до первой пустой или повторной страницы
+    pages = paginate(
+        f"{base_url}{{page}}", partial(fetch_page, raise_not_found=True), extract_transartists_listing,
+        start=0, headers={'User-Agent': 'Mozilla/5.0'}
+    )
+    with open_sink(output_file, fieldnames=TRANSARTISTS_SCHEMA.fields, dedup=True) as sink:
+        for url, records in pages:
+            sink.write_many(records)
+    logging.info("Saved Transartist opportunities to %s", output_file)
+
+
+def parse_resartis_opportunities(base_url, output_file):
+    """Парсинг сайта https://resartis.org/open-calls/"""
+    # Список отрисовывается JS, поэтому нужен браузер; страницы деталей грузятся обычным HTTP
+    try:
+        html = render_page(base_url, wait_for_class='grid__item')
+        items = extract_resartis_cards(html)
+        logging.info(f"Found {len(items)} elements with class 'grid__item postcard'.")
+    except Exception as e:
+        logging.error(f"Error: {e}")
+        return
+
+    # Собираем ссылки на страницы деталей, чтобы загрузить их одним пакетом
+    titles = {}
+    for item in items:
+        if not item['link']:
+            logging.warning(f"No link found for item: {item['title']}")
+            continue
+        titles[item['link']] = item['title']
+
+    # Страницы перепроверяются при каждом обходе (через HTTP-кэш), разбираются только изменившиеся
+    state = CrawlState('resartis')
+
+    digests = {}
+
+    def changed_pages():
+        for link, detail_html in fetch_pages(titles, fetch_page):
+            if not detail_html:
+                logging.warning(f"Failed to fetch details for {titles[link]}.")
+                continue
+
+            digests[link] = content_hash(detail_html)
+            if not state.is_unchanged(link, digests[link]):
+                yield link, detail_html
+
+    fieldnames = ['title', *RESARTIS_DETAIL_SCHEMA.fields, *RESARTIS_LABELS.values(), 'more_info_link']
+    parsed = set()
+    with open_sink(output_file, fieldnames=fieldnames, dedup=True) as sink:
+        # Разбор страниц деталей может идти в пуле процессов; записи пишутся сразу
+        unknown_labels = Counter()
+        for link, record in parse_pages(extract_resartis_details, changed_pages()):
+            if record is None:
+                continue
+            unknown_labels.update(record.pop('_unknown_labels'))
+            record = {'title': titles[link], **record}
+            state.save(link, digests[link], record)
+            sink.write(record)
+            parsed.add(link)
+            logging.info(f"Successfully processed: {titles[link]}")
+
+        # Новые заголовки означают, что на сайте появились поля, которые мы не собираем
+        for label, count in unknown_labels.most_common():
+            logging.warning(f"Unknown resartis label '{label}' on {count} pages")
+
+        # Добавляем ранее сохраненные записи неизменившихся страниц
+        sink.write_many(state.records(link for link in titles if link not in parsed))
+
+    state.close()
+    logging.info("Saved Resartis opportunities to %s", output_file)
+
+
+def parse_curatorspace_opportunities(base_url, output_file):
+    """Парсинг сайта https://www.curatorspace.com/opportunities"""
+    pages = paginate(
+        base_url, partial(fetch_page, raise_not_found=True), extract_curatorspace_listing,
+        start=1, headers={'User-Agent': 'Mozilla/5.0'}
+    )
+    with open_sink(output_file, fieldnames=CURATORSPACE_SCHEMA.fields) as sink:
+        for url, records in pages:
+            logging.info(f"Processing page {url}")
+            for record in records:
+                sink.write(record)
+    logging.info(f"Saved CuratorSpace data to {output_file}")
+
+
+def parse_artists_communities(base_url, output_file):
+    """Парсинг сайта https://artistcommunities.org/directory/open-calls"""
+
+    html = fetch_page(base_url, headers={'User-Agent': 'Mozilla/5.0'})
+    if not html:
+        logging.error("Failed to fetch the main page.")
+        return
+
+    soup = make_soup(html)
+    links = soup.select('td.views-field-label a')
+
+    # Формируем полные URL страниц деталей и загружаем их параллельно
+    details_urls = [urljoin(base_url, link['href']) for link in links]
+
+    # Страницы перепроверяются при каждом обходе (через HTTP-кэш), разбираются только изменившиеся
+    state = CrawlState('artistcommunities', fieldnames=ARTISTCOMMUNITIES_SCHEMA.fields)
+
+    digests = {}
+
+    def changed_pages():
+        for details_url, detail_html in fetch_pages(details_urls, fetch_page, headers={'User-Agent': 'Mozilla/5.0'}):
+            logging.info(f"Processing page {details_url}")
+            if not detail_html:
+                logging.warning(f"Failed to fetch details for {details_url}")
+                continue
+
+            digests[details_url] = content_hash(detail_html)
+            if not state.is_unchanged(details_url, digests[details_url]):
+                yield details_url, detail_html
+
+    parsed = set()
+    with open_sink(output_file, fieldnames=ARTISTCOMMUNITIES_SCHEMA.fields) as sink:
+        # Разбор страниц деталей может идти в пуле процессов; записи пишутся сразу
+        for details_url, record in parse_pages(extract_artists_community_details, changed_pages()):
+            if record is None:
+                logging.warning(f"No content found for {details_url}")
+                continue
+            state.save(details_url, digests[details_url], record)
+            sink.write(record)
+            parsed.add(details_url)
+
+        # Добавляем ранее сохраненные записи неизменившихся страниц
+        sink.write_many(state.records(url for url in details_urls if url not in parsed))
+
+    state.close()
+    logging.info('Saved Artistcommunities data to CSV')
@@ -0,0 +1,289 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from .normalize import COUNTRY_ALIASES, MISSING_VALUES
+
+# Пустое значение PARSING_STORE отключает запись в хранилище
+STORE_PATH = os.environ.get('PARSING_STORE', 'opportunities.sqlite')
+DEFAULT_LIMIT = 50
+# Ключей в одном IN (...): старые сборки SQLite принимают не больше 999 параметров запроса
+KEYS_PER_QUERY = 500
+
+# Общие колонки хранилища -> поле normalize.resolve_fields
+COLUMNS = {
+    'title': 'Open_Call_Title',
+    'country': 'City_Country',
+    'deadline': 'Deadline_Date',
+    'link': 'Application_Form_Link',
+    'fee': 'Fee',
+}
+
+
+def source_name(path):
+    """Источник записей по имени выходного файла: transartists.csv -> transartists."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _body(record):
+    return ' '.join(
+        str(value) for value in record.values()
+        if value is not None and value == value and str(value).strip() not in MISSING_VALUES
+    )
+
+
+def record_identity(record, columns):
+    """
+    Ключ записи в хранилище: ссылка и название open call, а если их нет - вся запись.
+    Не зависит от остальных полей, поэтому измененный срок или описание обновляют ту же запись.
+    """
+    title, link = columns['title'], columns['link']
+    if title or link:
+        value = [link, title]
+    else:
+        value = sorted(record.items())
+    return hashlib.blake2b(json.dumps(value, default=str).encode('utf-8'), digest_size=16).digest()
+
+
+def fts_query(text):
+    """Запрос FTS5 из произвольного текста: все слова должны встретиться (префикс, если слово кончается на *)."""
+    terms = []
+    for word in text.split():
+        prefix = word.endswith('*')
+        # Кавычки и знаки токенизатор все равно отбрасывает; слово без букв и цифр пропускаем
+        word = word.rstrip('*').replace('"', '')
+        if any(char.isalnum() for char in word):
+            terms.append(f'"{word}"' + ('*' if prefix else ''))
+    return ' '.join(terms)
+
+
+class OpportunityStore:
+    """
+    Общее хранилище записей всех источников в SQLite.
+
+    Записи приводятся к общим колонкам (название, страна, срок подачи, ссылка,
+    взнос) через normalize; по сроку, стране и источнику есть B-tree индексы,
+    по названию и всему тексту записи - полнотекстовый индекс FTS5. Запись
+    определяется источником, ссылкой и названием: повторно встреченная запись не
+    дублируется, а обновляется (изменившийся срок, описание) вместе с last_seen.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS opportunities (
+                id INTEGER PRIMARY KEY,
+                source TEXT NOT NULL,
+                record_key BLOB NOT NULL,  -- record_identity()
+                title TEXT,
+                country TEXT COLLATE NOCASE,
+                deadline TEXT,
+                link TEXT,
+                fee TEXT,
+                body TEXT NOT NULL,
+                record TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                UNIQUE (source, record_key)
+            );
+            CREATE INDEX IF NOT EXISTS opportunities_deadline ON opportunities (deadline);
+            CREATE INDEX IF NOT EXISTS opportunities_country ON opportunities (country, deadline);
+            CREATE INDEX IF NOT EXISTS opportunities_source ON opportunities (source, deadline);
+            CREATE VIRTUAL TABLE IF NOT EXISTS opportunities_fts USING fts5(
+                title, body, content='opportunities', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+            );
+            CREATE TRIGGER IF NOT EXISTS opportunities_fts_insert AFTER INSERT ON opportunities BEGIN
+                INSERT INTO opportunities_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+            END;
+            CREATE TRIGGER IF NOT EXISTS opportunities_fts_delete AFTER DELETE ON opportunities BEGIN
+                INSERT INTO opportunities_fts (opportunities_fts, rowid, title, body)
+                VALUES ('delete', old.id, old.title, old.body);
+            END;
+            CREATE TRIGGER IF NOT EXISTS opportunities_fts_update AFTER UPDATE OF title, body ON opportunities
+            WHEN old.title IS NOT new.title OR old.body IS NOT new.body BEGIN
+                INSERT INTO opportunities_fts (opportunities_fts, rowid, title, body)
+                VALUES ('delete', old.id, old.title, old.body);
+                INSERT INTO opportunities_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+            END;
+        """)
+
+    def add(self, source, records):
+        """
+        Добавляет пачку записей (словарей) источника source.
+
+        :return: Сколько записей новые.
+        """
+        import pandas as pd
+
+        from .normalize import resolve_fields
+
+        records = list(records)
+        if not records:
+            return 0
+        resolved = resolve_fields(pd.DataFrame.from_records(records))
+        now = time.time()
+        rows = []
+        for record, (_, values) in zip(records, resolved.iterrows()):
+            columns = {column: None if pd.isna(values[field]) else values[field] for column, field in COLUMNS.items()}
+            rows.append((
+                source, record_identity(record, columns), *columns.values(), _body(record),
+                json.dumps(record, ensure_ascii=False, default=str), now, now
+            ))
+
+        keys = list({row[1]: None for row in rows})
+        with self._lock, self._db:
+            known = 0
+            for start in range(0, len(keys), KEYS_PER_QUERY):
+                chunk = keys[start:start + KEYS_PER_QUERY]
+                known += self._db.execute(
+                    'SELECT COUNT(*) FROM opportunities '
+                    f"WHERE source = ? AND record_key IN ({', '.join('?' * len(chunk))})",
+                    (source, *chunk)
+                ).fetchone()[0]
+            # Полнотекстовый индекс известной записи перестраивается триггером, только если изменился ее текст
+            self._db.executemany(f"""
+                INSERT INTO opportunities (source, record_key, {', '.join(COLUMNS)}, body, record, first_seen, last_seen)
+                VALUES ({', '.join('?' * (len(COLUMNS) + 6))})
+                ON CONFLICT (source, record_key) DO UPDATE SET
+                    {', '.join(f'{column} = excluded.{column}' for column in COLUMNS)},
+                    body = excluded.body, record = excluded.record, last_seen = excluded.last_seen
+            """, rows)
+        return len(keys) - known
+
+    def search(self, text=None, country=None, source=None, deadline_after=None, deadline_before=None,
+               limit=DEFAULT_LIMIT):
+        """
+        Ищет записи по тексту (FTS5), стране, источнику и сроку подачи (YYYY-MM-DD).
+
+        :return: Список словарей с общими колонками и исходной записью в 'record',
+            по возрастанию срока (записи без срока - в конце).
+        """
+        conditions, params = [], []
+        # Запрос только из * или кавычек не содержит слов: текстового условия нет
+        query = fts_query(text or '')
+        if query:
+            conditions.append('o.id IN (SELECT rowid FROM opportunities_fts WHERE opportunities_fts MATCH ?)')
+            params.append(query)
+        if country:
+            conditions.append('o.country = ?')
+            params.append(COUNTRY_ALIASES.get(country.lower(), country))
+        if source:
+            conditions.append('o.source = ?')
+            params.append(source)
+        if deadline_after:
+            conditions.append('o.deadline >= ?')
+            params.append(deadline_after)
+        if deadline_before:
+            conditions.append('o.deadline <= ?')
+            params.append(deadline_before)
+        # Сначала записи со сроком в порядке индекса, затем без срока: так сортировка не требует
+        # временного B-дерева и LIMIT останавливает просмотр индекса
+        results = self._select(conditions + ['o.deadline IS NOT NULL'], params, 'o.deadline, o.id', limit)
+        if len(results) < limit:
+            results += self._select(conditions + ['o.deadline IS NULL'], params, 'o.id', limit - len(results))
+        return results
+
+    def _select(self, conditions, params, order, limit):
+        cursor = self._db.execute(f"""
+            SELECT o.source, {', '.join(f'o.{column}' for column in COLUMNS)}, o.record, o.first_seen, o.last_seen
+            FROM opportunities o WHERE {' AND '.join(conditions)}
+            ORDER BY {order} LIMIT ?
+        """, (*params, limit))
+        names = [description[0] for description in cursor.description]
+        results = []
+        for row in cursor:
+            result = dict(zip(names, row))
+            result['record'] = json.loads(result['record'])
+            results.append(result)
+        return results
+
+    def stats(self):
+        """Число записей по источникам."""
+        return dict(self._db.execute('SELECT source, COUNT(*) FROM opportunities GROUP BY source ORDER BY source'))
+
+    def close(self):
+        self._db.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Хранилище процесса или None, если оно отключено (PARSING_STORE='')."""
+    global _store
+    if not STORE_PATH:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = OpportunityStore()
+        return _store
+
+
+def import_files(store, paths, batch_size=500):
+    """Загружает в хранилище уже сохраненные файлы записей (.csv, .parquet, .arrow)."""
+    from .records import iter_rows
+
+    for path in paths:
+        source, batch, added, total = source_name(path), [], 0, 0
+        for row in iter_rows(path):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                added += store.add(source, batch)
+                total += len(batch)
+                batch = []
+        added += store.add(source, batch)
+        total += len(batch)
+        logging.info(f"Imported {path}: {added} new of {total} records")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Поиск по общему хранилищу open calls всех источников.')
+    parser.add_argument('--store', default=STORE_PATH or 'opportunities.sqlite', help='Файл хранилища SQLite')
+    commands = parser.add_subparsers(dest='command', required=True)
+    search = commands.add_parser('search', help='Найти записи')
+    search.add_argument('text', nargs='?', help='Слова для полнотекстового поиска (слово* - по префиксу)')
+    search.add_argument('--country')
+    search.add_argument('--source', help='Источник, например transartists')
+    search.add_argument('--after', help='Срок подачи не раньше YYYY-MM-DD')
+    search.add_argument('--before', help='Срок подачи не позже YYYY-MM-DD')
+    search.add_argument('--limit', type=int, default=DEFAULT_LIMIT)
+    search.add_argument('--json', action='store_true', help='Вывести записи целиком в JSON Lines')
+    load = commands.add_parser('import', help='Загрузить сохраненные файлы записей')
+    load.add_argument('paths', nargs='+')
+    commands.add_parser('stats', help='Показать число записей по источникам')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    store = OpportunityStore(args.store)
+    try:
+        if args.command == 'import':
+            import_files(store, args.paths)
+            print(store.stats())
+        elif args.command == 'stats':
+            print(store.stats())
+        else:
+            started = time.perf_counter()
+            results = store.search(args.text, args.country, args.source, args.after, args.before, args.limit)
+            elapsed = (time.perf_counter() - started) * 1000
+            for result in results:
+                if args.json:
+                    print(json.dumps(result, ensure_ascii=False))
+                else:
+                    print(f"{result['deadline'] or '-':<12}{result['country'] or '-':<18}{result['source']:<24}"
+                          f"{result['title'] or '-'}  {result['link'] or ''}")
+            logging.info(f"{len(results)} results in {elapsed:.1f} ms")
+    finally:
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
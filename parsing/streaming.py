@@ -0,0 +1,137 @@
+import json
+import os
+import queue
+import threading
+from itertools import islice
+
+from .records import iter_positioned_rows
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_QUEUE_CHUNKS = 4  # Сколько прочитанных пачек может ждать обработки
+DEFAULT_SAVE_EVERY = 50  # Как часто (в обработанных строках) сохранять контрольную точку
+
+
+class Checkpoint:
+    """
+    Контрольная точка обработки входного файла: в <path>.checkpoint хранится число
+    строк от начала файла, которые уже полностью обработаны, и позиция в файле после
+    них (records.iter_positioned_rows), с которой чтение продолжается без разбора
+    обработанных строк. Строки завершаются в любом порядке, сохраняется граница,
+    ниже которой обработано все.
+    """
+
+    def __init__(self, path, save_every=DEFAULT_SAVE_EVERY):
+        self.path = path + '.checkpoint'
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._done = set()
+        self._positions = {}  # Номер прочитанной строки -> позиция в файле после нее
+        self._unsaved = 0
+        self.offset = 0
+        self.position = None
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as file:
+                state = json.loads(file.read().strip() or '0')
+            # Контрольная точка старого формата - только число строк
+            if isinstance(state, int):
+                self.offset = state
+            else:
+                self.offset, self.position = state['row'], state['position']
+        self.start = self.offset
+
+    def track(self, index, position):
+        """Запоминает позицию в файле после строки index (вызывается при чтении)."""
+        with self._lock:
+            self._positions[index] = position
+
+    def done(self, index):
+        """Отмечает строку index обработанной."""
+        with self._lock:
+            self._done.add(index)
+            while self.offset in self._done:
+                self._done.remove(self.offset)
+                # Без позиции продолжение пропустит строки по счету
+                self.position = self._positions.pop(self.offset, None)
+                self.offset += 1
+                self._unsaved += 1
+            if self._unsaved >= self.save_every:
+                self._save()
+
+    def _save(self):
+        temporary = self.path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump({'row': self.offset, 'position': self.position}, file)
+        os.replace(temporary, self.path)
+        self._unsaved = 0
+
+    def save(self):
+        with self._lock:
+            self._save()
+
+    def finish(self):
+        """Файл обработан целиком: следующий запуск начнет сначала."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def stream_rows(path, start=0, chunk_size=DEFAULT_CHUNK_SIZE, queue_chunks=DEFAULT_QUEUE_CHUNKS, checkpoint=None):
+    """
+    Читает строки файла пачками в фоновом потоке и отдает пары (номер строки, строка).
+
+    Очередь пачек ограничена, поэтому чтение приостанавливается, пока обработка
+    отстает, и в памяти одновременно не больше queue_chunks + 1 пачек.
+
+    :param start: Сколько строк от начала файла пропустить.
+    :param checkpoint: Контрольная точка: чтение продолжается с ее позиции в файле
+                       (start не нужен), а позиции прочитанных строк запоминаются в ней.
+    :raises: Ошибку чтения файла - после уже прочитанных строк.
+    """
+    position = None
+    if checkpoint is not None:
+        start, position = checkpoint.start, checkpoint.position
+    chunks = queue.Queue(maxsize=queue_chunks)
+    finished = object()
+    stop = threading.Event()
+
+    def read():
+        try:
+            if position is not None:
+                rows = iter_positioned_rows(path, position)
+            else:
+                rows = islice(iter_positioned_rows(path), start, None)
+            index = start
+            while not stop.is_set():
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                if checkpoint is not None:
+                    for offset, (row_position, _) in enumerate(chunk):
+                        checkpoint.track(index + offset, row_position)
+                chunks.put((index, [row for _, row in chunk]))
+                index += len(chunk)
+        except Exception as e:
+            # Ошибка передается потребителю: иначе недочитанный файл выглядел бы обработанным целиком
+            chunks.put(e)
+        else:
+            chunks.put(finished)
+
+    thread = threading.Thread(target=read, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = chunks.get()
+            if item is finished:
+                break
+            if isinstance(item, Exception):
+                raise item
+            index, chunk = item
+            for offset, row in enumerate(chunk):
+                yield index + offset, row
+    finally:
+        # Потребитель остановился раньше конца файла: освобождаем место в очереди, чтобы поток завершился
+        stop.set()
+        while thread.is_alive():
+            try:
+                chunks.get(timeout=0.1)
+            except queue.Empty:
+                pass
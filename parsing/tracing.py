@@ -0,0 +1,165 @@
+import bisect
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Файл отчета: .json или .prom (текстовый формат Prometheus); пусто - отчет не пишется
+TRACE_PATH = os.environ.get('PARSING_TRACE', '')
+# Верхние границы корзин гистограмм, в секундах
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """Гистограмма длительностей с фиксированными корзинами BUCKETS."""
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)  # Последняя корзина - больше BUCKETS[-1]
+
+    def observe(self, seconds):
+        self.count += 1
+        self.sum += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+    def quantile(self, q):
+        """Оценка квантиля по верхней границе корзины."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip((*BUCKETS, self.max), self.buckets):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+
+_histograms = {}  # (stage, host) -> Histogram
+_lock = threading.Lock()
+
+
+def observe(name, seconds, host=''):
+    """Добавляет длительность этапа name."""
+    with _lock:
+        histogram = _histograms.get((name, host))
+        if histogram is None:
+            histogram = _histograms[(name, host)] = Histogram()
+        histogram.observe(seconds)
+
+
+@contextmanager
+def stage(name, host=''):
+    """Замеряет длительность блока как этап name (для сетевых этапов - с хостом)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, host)
+
+
+def traced(name):
+    """Декоратор: замеряет каждый вызов функции как этап name."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def drain():
+    """Забирает и сбрасывает накопленные гистограммы (для передачи из процессов разбора)."""
+    global _histograms
+    with _lock:
+        histograms, _histograms = _histograms, {}
+    return histograms
+
+
+def merge(histograms):
+    """Добавляет гистограммы, полученные из другого процесса."""
+    with _lock:
+        for key, other in histograms.items():
+            histogram = _histograms.get(key)
+            if histogram is None:
+                _histograms[key] = histogram = Histogram()
+            histogram.merge(other)
+
+
+def snapshot():
+    """Сводка по этапам: список словарей stage, host, count, sum, min, max, p50, p95."""
+    with _lock:
+        items = sorted(_histograms.items())
+        return [
+            {
+                'stage': name,
+                'host': host,
+                'count': histogram.count,
+                'sum': histogram.sum,
+                'min': histogram.min if histogram.count else 0.0,
+                'max': histogram.max,
+                'p50': histogram.quantile(0.5),
+                'p95': histogram.quantile(0.95),
+                'buckets': dict(zip([*map(str, BUCKETS), '+Inf'], histogram.buckets)),
+            }
+            for (name, host), histogram in items
+        ]
+
+
+def _prometheus_text(stages):
+    lines = [
+        '# HELP parsing_stage_seconds Duration of scraping pipeline stages.',
+        '# TYPE parsing_stage_seconds histogram',
+    ]
+    for item in stages:
+        labels = f'stage="{item["stage"]}",host="{item["host"]}"'
+        cumulative = 0
+        for bound, count in item['buckets'].items():
+            cumulative += count
+            lines.append(f'parsing_stage_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'parsing_stage_seconds_sum{{{labels}}} {item["sum"]}')
+        lines.append(f'parsing_stage_seconds_count{{{labels}}} {item["count"]}')
+    return '\n'.join(lines) + '\n'
+
+
+def export(path=None):
+    """Пишет отчет в path (по умолчанию TRACE_PATH): .prom - формат Prometheus, иначе JSON."""
+    path = path or TRACE_PATH
+    if not path:
+        return
+    stages = snapshot()
+    with open(path, 'w', encoding='utf-8') as file:
+        if path.endswith('.prom'):
+            file.write(_prometheus_text(stages))
+        else:
+            json.dump(stages, file, indent=2)
+    logging.info(f"Stage timings saved to {path}")
+
+
+def log_report():
+    """Пишет в лог итоговую таблицу по этапам."""
+    stages = snapshot()
+    if not stages:
+        return
+    logging.info(f"{'stage':<10}{'host':<28}{'count':>8}{'total, s':>10}{'p50, ms':>10}{'p95, ms':>10}")
+    for item in stages:
+        logging.info(
+            f"{item['stage']:<10}{item['host']:<28}{item['count']:>8}{item['sum']:>10.2f}"
+            f"{item['p50'] * 1000:>10.1f}{item['p95'] * 1000:>10.1f}"
+        )
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+import requests
+
+from .http_session import get_session
+from .ratelimit import retry_after_seconds
+from .tracing import stage
+
+OPEN_CALLS_URL = "https://beta.mirr.art/api/open_calls/"
+UPLOAD_CONCURRENCY = int(os.environ.get('PARSING_UPLOAD_CONCURRENCY', 4))
+UPLOAD_TIMEOUT = 30
+MAX_RETRIES = 5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+DEAD_LETTER_PATH = 'open_calls_dead_letter.jsonl'
+SENT_KEYS_PATH = 'open_calls_sent.txt'
+
+
+def build_payload(row):
+    """Формирует тело запроса open_calls из строки файла."""
+    return {
+        "city_country": row['City_Country'],
+        "open_call_title": row['Open_Call_Title'],
+        "deadline_date": row['Deadline_Date'],
+        "event_date": row['Event_Date'],
+        "application_from_link": row['Application_Form_Link'],
+        "selection_criteria": row['Selection_Criteria'],
+        "faq": row['FAQ'],
+        "fee": row['Fee'],
+        "application_guide": row['Application_Guide'],
+        "open_call_description": f"Open call in {row['City_Country']} titled {row['Open_Call_Title']}."
+    }
+
+
+def idempotency_key(payload):
+    """Ключ идемпотентности по полям, определяющим open call (текст FAQ и плана может меняться)."""
+    identity = [payload['open_call_title'], payload['deadline_date'], payload['city_country']]
+    return hashlib.sha256(json.dumps(identity, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def _retry_delay(response, attempt):
+    retry_after = retry_after_seconds(response.headers.get('Retry-After')) if response is not None else None
+    return retry_after if retry_after is not None else min(2 ** attempt, 60) + random.uniform(0, 1)
+
+
+def post_open_call(payload, key, url=None):
+    """
+    Отправляет один open call, повторяя запрос при 429/5xx и сетевых ошибках.
+    Адрес API и ключ берутся из OPEN_CALLS_URL и OPEN_CALLS_API_KEY при каждом
+    вызове, что позволяет подставить локальный мок.
+
+    :return: (успех, статус-код или None, текст ответа или ошибки).
+    """
+    url = url or os.environ.get('OPEN_CALLS_URL', OPEN_CALLS_URL)
+    headers = {
+        'Authorization': os.environ.get('OPEN_CALLS_API_KEY', 'KEY'),
+        'Accept': 'application/json',
+        'Idempotency-Key': key,
+    }
+    status, body = None, ''
+    for attempt in range(MAX_RETRIES + 1):
+        response = None
+        try:
+            with stage('upload', urlsplit(url).netloc):
+                response = get_session().post(url, headers=headers, json=payload, timeout=UPLOAD_TIMEOUT)
+            status, body = response.status_code, response.text[:1000]
+            if status in (200, 201):
+                return True, status, body
+            if status not in RETRY_STATUSES:
+                return False, status, body
+        except requests.exceptions.RequestException as e:
+            status, body = None, str(e)
+
+        if attempt < MAX_RETRIES:
+            time.sleep(_retry_delay(response, attempt))
+    return False, status, body
+
+
+class UploadLog:
+    """Файл ключей уже принятых open call и файл отклоненных строк (dead letter)."""
+
+    def __init__(self, sent_keys_path=SENT_KEYS_PATH, dead_letter_path=DEAD_LETTER_PATH):
+        self.sent_keys_path = sent_keys_path
+        self.dead_letter_path = dead_letter_path
+        self._lock = threading.Lock()
+        self.sent_keys = set()
+        self._reserved = set()  # Ключи строк, которые сейчас отправляются
+        if os.path.exists(sent_keys_path):
+            with open(sent_keys_path, encoding='utf-8') as file:
+                self.sent_keys = {line.strip() for line in file if line.strip()}
+
+    def reserve(self, key):
+        """Резервирует ключ перед отправкой; False, если строка уже принята или отправляется в другом потоке."""
+        with self._lock:
+            if key in self.sent_keys or key in self._reserved:
+                return False
+            self._reserved.add(key)
+            return True
+
+    def release(self, key):
+        """Снимает резерв с ключа, строка с которым не была принята."""
+        with self._lock:
+            self._reserved.discard(key)
+
+    def mark_sent(self, key):
+        with self._lock:
+            self._reserved.discard(key)
+            self.sent_keys.add(key)
+            with open(self.sent_keys_path, 'a', encoding='utf-8') as file:
+                file.write(key + '\n')
+
+    def dead_letter(self, row, status, error):
+        with self._lock:
+            with open(self.dead_letter_path, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(
+                    {'row': row, 'status': status, 'error': error, 'time': time.time()},
+                    ensure_ascii=False, default=str
+                ) + '\n')
+
+
+def upload_row(row, upload_log):
+    """Загружает одну строку; возвращает 'sent', 'skipped' или 'failed'."""
+    try:
+        payload = build_payload(row)
+    except KeyError as e:
+        upload_log.dead_letter(row, None, f"missing field {e}")
+        logging.error(f"Ошибка при отправке POST-запроса: нет поля {e}")
+        return 'failed'
+
+    key = idempotency_key(payload)
+    # Одинаковые строки в одном запуске: отправляет только поток, первым зарезервировавший ключ
+    if not upload_log.reserve(key):
+        return 'skipped'
+
+    try:
+        ok, status, body = post_open_call(payload, key)
+    except BaseException:
+        upload_log.release(key)
+        raise
+    if ok:
+        upload_log.mark_sent(key)
+        logging.info(f"Успешно отправлены данные для Open Call: {row['Open_Call_Title']}")
+        return 'sent'
+
+    upload_log.release(key)
+
+    upload_log.dead_letter(row, status, body)
+    logging.error(f"Ошибка при отправке данных для Open Call: {row['Open_Call_Title']}. Статус код: {status}")
+    return 'failed'
+
+
+def upload_rows(rows, concurrency=UPLOAD_CONCURRENCY, upload_log=None, on_done=None):
+    """
+    Параллельно загружает строки в open_calls API. Повторный запуск не отправляет
+    уже принятые строки, отклоненные строки попадают в DEAD_LETTER_PATH.
+
+    :param on_done: Необязательная функция on_done(row, status), вызывается по завершении каждой строки.
+    :return: Словарь счетчиков sent/skipped/failed.
+    """
+    upload_log = upload_log or UploadLog()
+    summary = {'sent': 0, 'skipped': 0, 'failed': 0}
+
+    def collect(done):
+        for future in done:
+            row = pending.pop(future)
+            status = future.result()
+            summary[status] += 1
+            if on_done:
+                on_done(row, status)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = {}
+        for row in rows:
+            pending[executor.submit(upload_row, row, upload_log)] = row
+            if len(pending) >= concurrency * 2:
+                collect(wait(pending, return_when=FIRST_COMPLETED).done)
+        collect(wait(pending).done)
+
+    logging.info(
+        f"Upload finished: {summary['sent']} sent, {summary['skipped']} already uploaded, "
+        f"{summary['failed']} failed (see {upload_log.dead_letter_path})"
+    )
+    return summary
@@ -1,38 +1,191 @@
+import argparse
+import ast
+import difflib
+import hashlib
+import json
+import logging
 import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
-def replace_in_file(file_path):
-    """Заменяет вызовы функций на новую универсальную функцию extract_data."""
-    with open(file_path, 'r', encoding='utf-8') as file:
+# Старое имя функции -> новое; заменяются только вызовы, аргументы остаются как были
+RENAMES = {
+    'safe_get_text': 'extract_data',
+    'get_text_or_none': 'extract_data',
+}
+
+CACHE_PATH = '.refactor_cache.json'
+SKIP_DIRS = {'.git', '__pycache__', '.venv', 'venv', '.tox', '.nox', 'node_modules'}
+WORKERS = os.cpu_count() or 1
+# Границы строк так, как их считает ast: только \n, \r\n и \r (str.splitlines делит и по \x0c, \u2028 и т.п.)
+_LINE_BREAK = re.compile(r'(?<=\n)|(?<=\r)(?!\n)')
+
+
+def rules_key(renames):
+    """Отпечаток набора правил: при изменении правил кэш перестает действовать."""
+    return hashlib.sha256(json.dumps(renames, sort_keys=True).encode()).hexdigest()
+
+
+def _name_span(func):
+    """Позиция имени вызываемой функции в исходнике: (строка, начало, конец) в байтах UTF-8."""
+    if isinstance(func, ast.Name):
+        return func.lineno, func.col_offset, func.end_col_offset
+    # obj.name(...): имя стоит в самом конце выражения func
+    return func.end_lineno, func.end_col_offset - len(func.attr), func.end_col_offset
+
+
+def rewrite_source(source, renames=RENAMES):
+    """
+    Переименовывает вызовы функций из renames по синтаксическому дереву.
+
+    Меняется только имя в позиции вызова, поэтому вложенные вызовы, переносы строк
+    и комментарии внутри аргументов сохраняются. Определения функций, строки и
+    имена без вызова не затрагиваются.
+
+    :return: Новый исходник (или тот же объект, если замен нет) и число замен.
+    """
+    edits = []
+    for node in ast.walk(ast.parse(source)):
+        if not isinstance(node, ast.Call):
+            continue
+        func = node.func
+        name = func.id if isinstance(func, ast.Name) else getattr(func, 'attr', None)
+        if name in renames:
+            edits.append((*_name_span(func), renames[name]))
+    if not edits:
+        return source, 0
+
+    lines = [line.encode('utf-8') for line in _LINE_BREAK.split(source)]
+    # С конца, чтобы смещения еще не обработанных замен в той же строке не сдвигались
+    for lineno, start, end, new in sorted(edits, reverse=True):
+        line = lines[lineno - 1]
+        lines[lineno - 1] = line[:start] + new.encode('utf-8') + line[end:]
+    return b''.join(lines).decode('utf-8'), len(edits)
+
+
+def process_file(file_path, renames=RENAMES, dry_run=False):
+    """
+    Применяет правила к одному файлу.
+
+    :return: (путь, sha256 итогового содержимого, число замен, diff или None).
+    """
+    with open(file_path, 'rb') as file:
         content = file.read()
+    source = content.decode('utf-8')
+    diff = None
+    count = 0
+    # Быстрая проверка подстрокой: файлы без старых имен не разбираются
+    if any(name in source for name in renames):
+        try:
+            new_source, count = rewrite_source(source, renames)
+        except SyntaxError as e:
+            logging.warning(f"Skipping {file_path}: {e}")
+            return file_path, None, 0, None
+        if count:
+            if dry_run:
+                diff = ''.join(difflib.unified_diff(
+                    source.splitlines(keepends=True), new_source.splitlines(keepends=True),
+                    fromfile=f'a/{file_path}', tofile=f'b/{file_path}'
+                ))
+            else:
+                content = new_source.encode('utf-8')
+                with open(file_path, 'wb') as file:
+                    file.write(content)
+    return file_path, hashlib.sha256(content).hexdigest(), count, diff
+
+
+def _process(args):
+    return process_file(*args)
+
 
-    # Замена вызовов safe_get_text
-    content = re.sub(
-        r'safe_get_text\((.+?),\s*tag=(.+?),\s*class_=(.+?),\s*default=(.+?)\)',
-        r'extract_data(\1, tag=\2, class_=\3, default=\4)',
-        content
+def python_files(paths):
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(name for name in dirs if name not in SKIP_DIRS)
+            for file in sorted(files):
+                if file.endswith('.py'):
+                    yield os.path.join(root, file)
+
+
+def load_cache(path, renames):
+    """Кэш путь -> sha256 содержимого, для которого правила уже применены."""
+    try:
+        with open(path, encoding='utf-8') as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return cache.get('files', {}) if cache.get('rules') == rules_key(renames) else {}
+
+
+def save_cache(path, renames, files):
+    temporary = path + '.tmp'
+    with open(temporary, 'w', encoding='utf-8') as file:
+        json.dump({'rules': rules_key(renames), 'files': files}, file, indent=0, sort_keys=True)
+    os.replace(temporary, path)
+
+
+def _file_hash(file_path):
+    with open(file_path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def process_directory(paths, renames=RENAMES, dry_run=False, workers=WORKERS, cache_path=CACHE_PATH):
+    """
+    Применяет правила ко всем .py файлам в paths в пуле процессов.
+
+    Файлы, содержимое которых не изменилось с прошлого запуска с теми же правилами,
+    пропускаются по кэшу хэшей (cache_path=None отключает кэш).
+
+    :return: Словарь путь -> число замен для измененных (при dry_run - требующих изменений) файлов.
+    """
+    cache = load_cache(cache_path, renames) if cache_path else {}
+    paths = list(python_files(paths))
+    files = [path for path in paths if cache.get(path) != _file_hash(path)]
+    logging.info(f"Rewriting {len(files)} files ({len(paths) - len(files)} unchanged since last run)")
+
+    changed = {}
+    tasks = [(path, renames, dry_run) for path in files]
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        if workers <= 1 or len(tasks) < 2:
+            results = map(_process, tasks)
+        else:
+            results = pool.map(_process, tasks, chunksize=max(1, len(tasks) // (workers * 4)))
+        for file_path, digest, count, diff in results:
+            if diff:
+                sys.stdout.write(diff)
+            if count:
+                changed[file_path] = count
+                logging.info(f"{file_path}: {count} calls")
+            # В режиме dry_run файл с заменами не изменен, поэтому в кэш не попадает
+            if digest and not (dry_run and count):
+                cache[file_path] = digest
+
+    if cache_path:
+        save_cache(cache_path, renames, cache)
+    logging.info(f"{'Would rewrite' if dry_run else 'Rewrote'} {sum(changed.values())} calls in {len(changed)} files")
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Замена вызовов устаревших функций на extract_data по синтаксическому дереву.'
     )
+    parser.add_argument('paths', nargs='*', default=['.'], help='Файлы или каталоги (по умолчанию текущий)')
+    parser.add_argument('--dry-run', action='store_true', help='Показать diff без записи файлов')
+    parser.add_argument('--workers', type=int, default=WORKERS, help='Число процессов')
+    parser.add_argument('--cache', default=CACHE_PATH, help='Файл кэша хэшей')
+    parser.add_argument('--no-cache', action='store_true', help='Обработать все файлы заново')
+    args = parser.parse_args()
 
-    # Замена вызовов get_text_or_none
-    content = re.sub(
-        r'get_text_or_none\((.+?)\)',
-        r'extract_data(\1)',
-        content
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s', stream=sys.stderr)
+    process_directory(
+        args.paths, dry_run=args.dry_run, workers=args.workers, cache_path=None if args.no_cache else args.cache
     )
 
-    # Записываем изменения обратно в файл
-    with open(file_path, 'w', encoding='utf-8') as file:
-        file.write(content)
-
-def process_directory(directory_path):
-    """Обрабатывает все файлы Python в указанной директории."""
-    for root, _, files in os.walk(directory_path):
-        for file in files:
-            if file.endswith('.py'):  # Только Python файлы
-                file_path = os.path.join(root, file)
-                print(f"Processing file: {file_path}")
-                replace_in_file(file_path)
-
-# Укажите путь к директории с кодом
-directory_path = "."
-process_directory(directory_path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Пакет parsing не устанавливается: тесты импортируют его из корня репозитория
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
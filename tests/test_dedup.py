@@ -0,0 +1,70 @@
+import sqlite3
+
+import pytest
+
+from parsing.dedup import DedupIndex, mark_duplicates
+
+TEXT = 'Summer residency for painters in Lisbon with studio, housing and a monthly stipend'
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = DedupIndex(str(tmp_path / 'dedup.sqlite'))
+    yield index
+    index.close()
+
+
+def test_exact_copy_from_another_source_is_duplicate(index):
+    first, original = index.check(TEXT, 'transartists.csv', 0)
+    assert original is None
+    assert index.check(TEXT, 'resartis.csv', 0)[1] == first
+
+
+def test_exact_copy_in_same_file_is_duplicate(index):
+    first, _ = index.check(TEXT, 'transartists.csv', 0)
+    assert index.check(TEXT, 'transartists.csv', 5)[1] == first
+
+
+def test_near_duplicate_points_to_original(index):
+    first, _ = index.check(TEXT, 'transartists.csv', 0)
+    assert index.check(TEXT + ' and meals', 'resartis.csv', 0)[1] == first
+
+
+def test_rerun_of_same_row_is_not_duplicate(index):
+    first, _ = index.check(TEXT, 'transartists.csv', 0)
+    assert index.check(TEXT, 'transartists.csv', 0) == (first, None)
+
+
+def test_copy_of_duplicate_points_to_first_original(index):
+    first, _ = index.check(TEXT, 'a.csv', 0)
+    index.check(TEXT, 'b.csv', 0)
+    assert index.check(TEXT, 'c.csv', 0)[1] == first
+
+
+def test_mark_duplicates_numbers_rows(index):
+    rows = [{'Title': TEXT}, {'Title': 'Call for curators in Berlin'}, {'Title': TEXT}]
+    assert [original is not None for _, original in mark_duplicates(rows, index, 'a.csv')] == [False, False, True]
+    # Повторный запуск того же файла дает тот же результат
+    assert [original is not None for _, original in mark_duplicates(rows, index, 'a.csv')] == [False, False, True]
+
+
+def test_legacy_index_is_migrated(tmp_path):
+    path = str(tmp_path / 'dedup.sqlite')
+    index = DedupIndex(path)
+    first, _ = index.check(TEXT, 'a.csv', 0)
+    index.close()
+    # Индекс старого формата: ключ уникален, номеров строк нет
+    db = sqlite3.connect(path)
+    db.executescript("""
+        ALTER TABLE records RENAME TO records_new;
+        CREATE TABLE records (id INTEGER PRIMARY KEY, key TEXT UNIQUE NOT NULL, source TEXT,
+                              signature BLOB NOT NULL, duplicate_of INTEGER);
+        INSERT INTO records SELECT id, key, source, signature, duplicate_of FROM records_new;
+        DROP TABLE records_new;
+    """)
+    db.close()
+
+    index = DedupIndex(path)
+    assert index.check(TEXT, 'a.csv', 3) == (first, None)
+    assert index.check(TEXT, 'b.csv', 0)[1] == first
+    index.close()
@@ -0,0 +1,68 @@
+import threading
+import time
+from urllib.request import urlopen
+
+import pytest
+
+from parsing.fetcher import fetch_pages
+from parsing.replay import FixtureArchive, ReplayServer, replay_url
+
+URLS = [f'https://example.org/page/{index}' for index in range(30)]
+
+
+@pytest.fixture
+def server(tmp_path):
+    archive = FixtureArchive(str(tmp_path))
+    for url in URLS:
+        archive.put(url, f'<html>{url}</html>')
+    server = ReplayServer(archive, latency=0.01).start()
+    yield server
+    server.stop()
+
+
+def make_fetch(server):
+    calls = []
+
+    def fetch(url, headers):
+        calls.append(url)
+        try:
+            with urlopen(replay_url(url, server.url), timeout=5) as response:
+                return response.read()
+        except OSError:
+            return None
+
+    return fetch, calls
+
+
+def test_fetch_pages_returns_every_page(server):
+    fetch, _ = make_fetch(server)
+    pages = dict(fetch_pages(URLS + ['https://example.org/missing'], fetch, concurrency=4))
+
+    assert set(pages) == set(URLS) | {'https://example.org/missing'}
+    assert pages['https://example.org/missing'] is None
+    assert all(pages[url] == f'<html>{url}</html>'.encode() for url in URLS)
+
+
+def test_links_are_read_in_calling_thread(server):
+    fetch, _ = make_fetch(server)
+    threads = set()
+
+    def links():
+        for url in URLS:
+            threads.add(threading.get_ident())
+            yield url
+
+    assert len(list(fetch_pages(links(), fetch, concurrency=4))) == len(URLS)
+    assert threads == {threading.get_ident()}
+
+
+def test_early_stop_cancels_fetching(server):
+    fetch, calls = make_fetch(server)
+    pages = fetch_pages(URLS, fetch, concurrency=2)
+    next(pages)
+    pages.close()
+
+    # Загружаются только ссылки, уже переданные циклу (не больше 2 * concurrency)
+    assert len(calls) <= 4
+    time.sleep(0.1)
+    assert len(calls) <= 4
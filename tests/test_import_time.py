@@ -0,0 +1,19 @@
+import os
+
+import pytest
+
+from benchmarks.import_time import IMPORT_BUDGETS, budget_ms, measure
+
+
+@pytest.fixture(autouse=True)
+def repo_root(monkeypatch):
+    # Замер запускается в новом интерпретаторе, который ищет пакет в текущем каталоге
+    monkeypatch.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.mark.parametrize('statement', list(IMPORT_BUDGETS))
+def test_import_stays_within_budget(statement):
+    elapsed, loaded = measure(statement)
+    assert not loaded, f"{statement} loads {', '.join(loaded)}"
+    budget = budget_ms(statement)
+    assert elapsed <= budget, f"{statement}: {elapsed:.1f} ms, budget {budget:.1f} ms"
@@ -0,0 +1,141 @@
+import json
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from parsing import llm
+
+FIELDS = {'Open_Call_Title': 'title', 'Fee': 'fee'}
+
+
+class OpenAIMock(ThreadingHTTPServer):
+    """Локальный сервер с ответами /chat/completions; failures - сколько первых запросов ответить 500."""
+
+    def __init__(self, failures=0, retry_after='0'):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.failures = failures
+        self.retry_after = retry_after
+        self.requests = []
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}/v1'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.requests.append(body)
+        if len(self.server.requests) <= self.server.failures:
+            self._reply(500, {'error': {'message': 'overloaded', 'type': 'server_error'}}, {'Retry-After': self.server.retry_after})
+            return
+        arguments = {'Open_Call_Title': '  Summer Residency ', 'Fee': 'No fee'}
+        self._reply(200, {
+            'id': 'chatcmpl-1',
+            'object': 'chat.completion',
+            'created': 0,
+            'model': body['model'],
+            'choices': [{
+                'index': 0,
+                'finish_reason': 'tool_calls',
+                'message': {
+                    'role': 'assistant',
+                    'content': None,
+                    'tool_calls': [{
+                        'id': 'call_1',
+                        'type': 'function',
+                        'function': {'name': 'save_open_call', 'arguments': json.dumps(arguments)},
+                    }],
+                },
+            }],
+            'usage': {'prompt_tokens': 10, 'completion_tokens': 5, 'total_tokens': 15},
+        })
+
+    def _reply(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def mock_api(monkeypatch):
+    servers = []
+
+    def start(failures=0, retry_after='0'):
+        server = OpenAIMock(failures, retry_after)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        monkeypatch.setenv('OPENAI_BASE_URL', server.url)
+        monkeypatch.setenv('OPENAI_API_KEY', 'test')
+        monkeypatch.setattr(llm, '_client', None)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return llm.PromptCache(str(tmp_path / 'llm_cache.sqlite'))
+
+
+def test_tool_call_arguments_become_fields(mock_api, cache):
+    server = mock_api()
+    result, stats = llm.normalize_row({'title': 'Summer Residency'}, cache, FIELDS)
+
+    assert result == {'Open_Call_Title': 'Summer Residency', 'Fee': 'No fee'}
+    assert stats['tokens'] == 15 and not stats['cached']
+    request = server.requests[0]
+    assert request['tool_choice']['function']['name'] == 'save_open_call'
+    assert set(request['tools'][0]['function']['parameters']['required']) == set(FIELDS)
+
+
+def test_repeated_row_is_served_from_cache(mock_api, cache):
+    server = mock_api()
+    first, _ = llm.normalize_row({'title': 'Summer Residency'}, cache, FIELDS)
+    second, stats = llm.normalize_row({'title': 'Summer Residency'}, cache, FIELDS)
+
+    assert second == first
+    assert stats == {'tokens': 0, 'latency': 0.0, 'cached': True}
+    assert len(server.requests) == 1
+
+
+def test_server_errors_are_retried(mock_api, cache):
+    server = mock_api(failures=2)
+    result, _ = llm.normalize_row({'title': 'Summer Residency'}, cache, FIELDS)
+
+    assert result['Open_Call_Title'] == 'Summer Residency'
+    assert len(server.requests) == 3
+
+
+def test_gives_up_after_max_retries(mock_api, cache, monkeypatch):
+    monkeypatch.setattr(llm, 'MAX_RETRIES', 1)
+    server = mock_api(failures=5)
+    with pytest.raises(llm.openai.InternalServerError):
+        llm.normalize_row({'title': 'Summer Residency'}, cache, FIELDS)
+
+    assert len(server.requests) == 2
+    assert cache.get(llm.prompt_hash(llm.build_request({'title': 'Summer Residency'}, FIELDS))) is None
+
+
+def test_retry_after_http_date_is_understood(mock_api, cache, monkeypatch):
+    delays = []
+    monkeypatch.setattr(llm.time, 'sleep', delays.append)
+    server = mock_api(failures=1, retry_after=formatdate(usegmt=True))
+    llm.normalize_row({'title': 'Summer Residency'}, cache, FIELDS)
+
+    assert len(server.requests) == 2
+    # Дата в Retry-After - сейчас, поэтому пауза не экспоненциальная (от 1 с)
+    assert delays and delays[0] < 1
@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+from parsing.normalize import parse_countries, parse_dates, parse_fees
+
+
+def parse(parser, text):
+    value = parser(pd.Series([text], dtype='string'))[0]
+    return None if pd.isna(value) else value
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('2025-03-15', '2025-03-15'),
+    ('Deadline: 15 March 2025', '2025-03-15'),
+    ('March 15th, 2025', '2025-03-15'),
+    ('Apply by Sept. 1, 2025', '2025-09-01'),
+    ('15.03.2025', '2025-03-15'),
+    ('15/03/2025', '2025-03-15'),
+    ('03/15/2025', '2025-03-15'),
+    ('05/05/2025', '2025-05-05'),
+    # День и месяц не различить: решает модель
+    ('03/04/2025', None),
+    ('Rolling deadline', None),
+])
+def test_parse_dates(text, expected):
+    assert parse(parse_dates, text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Berlin, Germany', 'Germany'),
+    ('Lisbon, portugal.', 'Portugal'),
+    ('New York, USA', 'United States'),
+    ('Atlanta, Georgia, USA', 'United States'),
+    ('Juba, South Sudan', 'South Sudan'),
+    ('Bissau, Guinea-Bissau', 'Guinea-Bissau'),
+    ('Conakry, Guinea', 'Guinea'),
+    ('Port Moresby, Papua New Guinea', 'Papua New Guinea'),
+    ('Santa Fe, New Mexico', None),
+    # Штат США и личные имена страну не определяют
+    ('Atlanta, Georgia', None),
+    ('Curated by Chad Smith in London', None),
+    ('Residency in Japan', 'Japan'),
+    ('Residency in France for artists from Japan', None),
+    ('Tbilisi, Georgia', None),
+])
+def test_parse_countries(text, expected):
+    assert parse(parse_countries, text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Application fee: $25', '25 USD'),
+    ('Fee: 25 EUR', '25 EUR'),
+    ('$25 entry fee', '25 USD'),
+    ('Entry fee of €1,200', '1200 EUR'),
+    ('application fee (non-refundable): CA$40', '40 CAD'),
+    ('No application fee', 'Free'),
+    ('Fees are waived for students', 'Free'),
+    ('Fee: free', 'Free'),
+    ('Free of charge', 'Free'),
+    ('Application fee: 30 EUR. Artists receive a $500 stipend.', '30 EUR'),
+    # Деньги, которые получает художник, - не взнос
+    ('Artists receive $500 fee', None),
+    ('Fees and support: artists receive €500 per month', None),
+    ('Artist fee: $300', None),
+    ("Artists' fees: 1000 EUR", None),
+    ('Stipend of $1000', None),
+])
+def test_parse_fees(text, expected):
+    assert parse(parse_fees, text) == expected
@@ -0,0 +1,99 @@
+import pytest
+
+from parsing import http_cache
+from parsing import replay
+from parsing.pagination import PageNotFound, paginate
+from parsing.core import fetch_page
+from parsing.replay import FixtureArchive, ReplayServer
+
+LISTING = 'https://example.org/calls?page={page}'
+
+
+def listing_fetch(pages, failed=()):
+    """Загрузка списка из pages страниц: дальше - 404, номера из failed - сбой загрузки."""
+    def fetch(url, headers):
+        page = int(url.rsplit('=', 1)[1])
+        if page in failed:
+            return None
+        if page >= pages:
+            raise PageNotFound(url)
+        return f'page {page}'
+    return fetch
+
+
+def extract(html):
+    return [{'page': html}]
+
+
+def test_missing_page_ends_listing():
+    pages = list(paginate(LISTING, listing_fetch(3), extract))
+    assert [url for url, _ in pages] == [LISTING.format(page=page) for page in range(3)]
+
+
+def test_failed_page_fails_pagination():
+    pages = paginate(LISTING, listing_fetch(5, failed={2}), extract)
+    with pytest.raises(RuntimeError, match='page=2'):
+        list(pages)
+
+
+def test_missing_first_page_fails_pagination():
+    with pytest.raises(RuntimeError, match='not found'):
+        list(paginate(LISTING, listing_fetch(0), extract))
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    archive = FixtureArchive(str(tmp_path / 'fixtures'))
+    archive.put(LISTING.format(page=0), '<html>calls</html>')
+    server = ReplayServer(archive).start()
+    monkeypatch.setattr(replay, 'REPLAY_URL', server.url)
+    monkeypatch.setattr(http_cache, '_cache', http_cache.HttpCache(str(tmp_path / 'cache')))
+    yield server
+    server.stop()
+
+
+def test_fetch_page_reports_missing_page(server):
+    assert fetch_page(LISTING.format(page=0), {}, raise_not_found=True) == b'<html>calls</html>'
+    with pytest.raises(PageNotFound):
+        fetch_page(LISTING.format(page=1), {}, raise_not_found=True)
+    # Без raise_not_found отсутствующая страница, как и сбой, дает None
+    assert fetch_page(LISTING.format(page=1), {}) is None
+
+
+class StubQueue:
+    def __init__(self):
+        self.jobs = []
+
+    def has_records(self, output, records):
+        return False
+
+    def enqueue(self, kind, payload, priority=0):
+        self.jobs.append((kind, payload))
+        return True
+
+
+@pytest.fixture
+def listing_job(monkeypatch):
+    from parsing import jobs
+
+    monkeypatch.setitem(jobs.PAGED_LISTINGS, 'example', (extract, 0))
+
+    def run(fetch, page):
+        monkeypatch.setattr(jobs, 'fetch_page', lambda url, headers, raise_not_found=False: fetch(url, headers))
+        queue = StubQueue()
+        records = jobs.listing_page(queue, {'site': 'example', 'url': LISTING, 'page': page, 'output': 'out.csv'})
+        return records, queue.jobs
+
+    return run
+
+
+def test_listing_job_ends_on_missing_page(listing_job):
+    assert listing_job(listing_fetch(3), 1) == ([{'page': 'page 1'}], [
+        ('listing_page', {'site': 'example', 'url': LISTING, 'page': 2, 'output': 'out.csv'})
+    ])
+    assert listing_job(listing_fetch(3), 3) == ([], [])
+
+
+def test_listing_job_fails_on_unavailable_page(listing_job):
+    with pytest.raises(RuntimeError):
+        listing_job(listing_fetch(5, failed={2}), 2)
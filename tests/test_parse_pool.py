@@ -0,0 +1,40 @@
+import threading
+
+import pytest
+
+from parsing import parse_pool
+
+
+@pytest.fixture(autouse=True)
+def pool(monkeypatch):
+    monkeypatch.setattr(parse_pool, 'PARSE_WORKERS', 2)
+    yield
+    parse_pool.close_parse_pool()
+
+
+def test_pages_are_parsed_in_pool():
+    pages = [(index, b'x' * index) for index in range(20)]
+    assert dict(parse_pool.parse_pages(len, pages)) == {index: index for index in range(20)}
+
+
+def test_concurrent_parsers_share_one_pool():
+    results, pools = [], set()
+
+    def parse(name):
+        for key, record in parse_pool.parse_pages(len, ((f'{name}{index}', b'x') for index in range(10))):
+            pools.add(id(parse_pool._pool))
+            results.append(key)
+
+    threads = [threading.Thread(target=parse, args=(name,)) for name in 'abc']
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 30
+    assert len(pools) == 1
+    assert len(parse_pool._pool._processes) <= 2
+
+
+def test_failed_page_gives_none():
+    assert list(parse_pool.parse_pages(int, [('bad', b'not a number')])) == [('bad', None)]
@@ -0,0 +1,45 @@
+import pytest
+
+from parsing import sinks
+from parsing import store
+from parsing.store import OpportunityStore
+
+
+@pytest.fixture
+def opportunities(tmp_path):
+    opportunities = OpportunityStore(str(tmp_path / 'opportunities.sqlite'))
+    yield opportunities
+    opportunities.close()
+
+
+def call(index, **fields):
+    return {'Title': f'Residency {index}', 'Link': f'https://example.org/{index}', 'Deadline': '2026-12-01', **fields}
+
+
+def test_large_batch_counts_new_records(opportunities, monkeypatch):
+    monkeypatch.setattr(store, 'KEYS_PER_QUERY', 7)
+    assert opportunities.add('transartists', [call(index) for index in range(1200)]) == 1200
+    # Половина записей уже известна, повторы внутри пачки считаются один раз
+    batch = [call(index) for index in range(600, 1800)] + [call(1700)]
+    assert opportunities.add('transartists', batch) == 600
+    assert opportunities.stats() == {'transartists': 1800}
+
+
+def test_changed_record_is_updated(opportunities):
+    opportunities.add('resartis', [call(1, Description='painting')])
+    assert opportunities.add('resartis', [call(1, Description='sculpture', Deadline='2027-01-15')]) == 0
+
+    assert [result['deadline'] for result in opportunities.search('sculpture')] == ['2027-01-15']
+    assert opportunities.search('painting') == []
+
+
+def test_empty_query_matches_everything(opportunities):
+    opportunities.add('resartis', [call(1), call(2)])
+    assert len(opportunities.search('"*')) == 2
+
+
+def test_open_sink_keeps_given_store(tmp_path, opportunities, monkeypatch):
+    monkeypatch.setattr(sinks, 'get_store', lambda: pytest.fail('get_store() called'))
+    with sinks.open_sink(str(tmp_path / 'calls.csv'), fieldnames=['Title', 'Link'], store=opportunities) as sink:
+        sink.write({'Title': 'Residency', 'Link': 'https://example.org/1'})
+    assert opportunities.stats() == {'calls': 1}
@@ -0,0 +1,79 @@
+import csv
+import json
+
+import pytest
+
+from parsing.records import iter_positioned_rows, iter_rows
+from parsing.sinks import open_sink
+from parsing.streaming import Checkpoint, stream_rows
+
+FIELDS = ['Link', 'Title']
+ROWS = [{'Link': f'https://example.org/{index}', 'Title': f'Call {index}\nsecond line'} for index in range(25)]
+
+
+@pytest.fixture(params=['.csv', '.arrow', '.parquet'])
+def path(request, tmp_path):
+    path = str(tmp_path / f'links{request.param}')
+    with open_sink(path, fieldnames=FIELDS, batch_size=10, store=None) as sink:
+        sink.write_many(ROWS)
+    return path
+
+
+def run(path, stop_after=None):
+    """Обрабатывает файл с контрольной точкой; stop_after - прервать после стольких строк."""
+    checkpoint = Checkpoint(path, save_every=1)
+    seen = []
+    for index, row in stream_rows(path, chunk_size=4, checkpoint=checkpoint):
+        seen.append((index, row['Link']))
+        checkpoint.done(index)
+        if len(seen) == stop_after:
+            break
+    checkpoint.save()
+    return seen
+
+
+def test_positions_resume_reading(path):
+    rows = list(iter_positioned_rows(path))
+    assert [row for _, row in rows] == ROWS
+    for number, (position, _) in enumerate(rows):
+        assert [row for _, row in iter_positioned_rows(path, position)] == ROWS[number + 1:]
+
+
+def test_interrupted_run_resumes_after_checkpoint(path):
+    assert len(run(path, stop_after=13)) == 13
+    resumed = run(path)
+    assert resumed == [(index, row['Link']) for index, row in enumerate(ROWS)][13:]
+
+
+def test_csv_resume_does_not_read_processed_rows(tmp_path):
+    path = str(tmp_path / 'links.csv')
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(ROWS)
+    run(path, stop_after=10)
+
+    # Обработанные строки портятся: продолжение не должно их декодировать
+    with open(path + '.checkpoint', encoding='utf-8') as file:
+        position = json.load(file)['position']
+    with open(path, 'r+b') as file:
+        file.seek(position - 5)
+        file.write(b'\xff\xff\xff\xff\n')
+    assert [index for index, _ in run(path)] == list(range(10, 25))
+
+
+def test_legacy_checkpoint_skips_rows(tmp_path):
+    path = str(tmp_path / 'links.csv')
+    with open_sink(path, fieldnames=FIELDS, store=None) as sink:
+        sink.write_many(ROWS)
+    with open(path + '.checkpoint', 'w', encoding='utf-8') as file:
+        file.write('20')
+    assert [index for index, _ in run(path)] == list(range(20, 25))
+
+
+def test_csv_rows_match_dict_reader(tmp_path):
+    path = str(tmp_path / 'rows.csv')
+    with open(path, 'w', newline='', encoding='utf-8-sig') as file:
+        file.write('a,b\r\n1,2\r\n\r\n3\r\n4,5,6\r\n"x\r\ny",z\r\n')
+    with open(path, newline='', encoding='utf-8-sig') as file:
+        assert list(iter_rows(path)) == list(csv.DictReader(file))
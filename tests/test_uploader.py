@@ -0,0 +1,147 @@
+import json
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from parsing import uploader
+
+ROW = {
+    'City_Country': 'Portugal',
+    'Open_Call_Title': 'Summer Residency',
+    'Deadline_Date': '2026-12-01',
+    'Event_Date': '2027-06',
+    'Application_Form_Link': 'https://example.org/apply',
+    'Selection_Criteria': 'Portfolio',
+    'FAQ': '',
+    'Fee': 'No fee',
+    'Application_Guide': '',
+}
+
+
+class OpenCallsMock(ThreadingHTTPServer):
+    """Локальный API open_calls: отвечает статусами из responses по очереди, затем 201."""
+
+    daemon_threads = True
+
+    def __init__(self, responses=()):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.responses = list(responses)
+        self.requests = []
+        self.accepted = {}  # Idempotency-Key -> id созданного open call
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}/api/open_calls/'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        key = self.headers['Idempotency-Key']
+        self.server.requests.append((dict(self.headers), body))
+        if self.server.responses:
+            status, headers = self.server.responses.pop(0)
+            return self._reply(status, {'error': 'try later'}, headers)
+        # Повтор с известным ключом возвращает уже созданную запись, а не новую
+        created = key not in self.server.accepted
+        self.server.accepted.setdefault(key, len(self.server.accepted) + 1)
+        self._reply(201 if created else 200, {'id': self.server.accepted[key]})
+
+    def _reply(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def api(monkeypatch):
+    servers = []
+
+    def start(responses=()):
+        server = OpenCallsMock(responses)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        monkeypatch.setenv('OPEN_CALLS_URL', server.url)
+        monkeypatch.setenv('OPEN_CALLS_API_KEY', 'Token test')
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def upload_log(tmp_path):
+    return uploader.UploadLog(str(tmp_path / 'sent.txt'), str(tmp_path / 'dead_letter.jsonl'))
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    # Паузы перед повторами записываются, но не выдерживаются
+    delays = []
+    monkeypatch.setattr(uploader.time, 'sleep', delays.append)
+    return delays
+
+
+def test_accepted_row_is_sent_once(api, upload_log):
+    server = api()
+    assert uploader.upload_row(ROW, upload_log) == 'sent'
+    assert uploader.upload_row(ROW, upload_log) == 'skipped'
+
+    headers, body = server.requests[0]
+    assert len(server.requests) == 1
+    assert headers['Authorization'] == 'Token test'
+    assert body['open_call_title'] == 'Summer Residency'
+
+
+def test_throttled_request_waits_retry_after(api, upload_log, delays):
+    server = api([(429, {'Retry-After': '7'})])
+    assert uploader.upload_row(ROW, upload_log) == 'sent'
+    assert len(server.requests) == 2
+    assert delays == [7.0]
+
+
+def test_server_error_is_retried_with_same_key(api, upload_log, delays):
+    server = api([(500, {}), (503, {})])
+    assert uploader.upload_row(ROW, upload_log) == 'sent'
+
+    keys = {headers['Idempotency-Key'] for headers, _ in server.requests}
+    assert len(server.requests) == 3 and len(keys) == 1
+    assert len(delays) == 2
+
+
+def test_replayed_key_is_accepted_after_restart(api, tmp_path, delays):
+    server = api()
+    first = uploader.UploadLog(str(tmp_path / 'sent.txt'), str(tmp_path / 'dead.jsonl'))
+    assert uploader.upload_row(ROW, first) == 'sent'
+
+    # Файл отправленных ключей потерян: сервер узнает ключ и не создает запись заново
+    second = uploader.UploadLog(str(tmp_path / 'other.txt'), str(tmp_path / 'dead.jsonl'))
+    assert uploader.upload_row(ROW, second) == 'sent'
+    assert len(server.requests) == 2 and len(server.accepted) == 1
+
+
+def test_rejected_row_goes_to_dead_letter(api, upload_log, delays):
+    api([(500, {})] * (uploader.MAX_RETRIES + 1))
+    assert uploader.upload_row(ROW, upload_log) == 'failed'
+    with open(upload_log.dead_letter_path, encoding='utf-8') as file:
+        assert json.loads(file.readline())['status'] == 500
+    # Ключ не зарезервирован: следующий запуск отправит строку снова
+    assert upload_log.reserve(uploader.idempotency_key(uploader.build_payload(ROW)))
+
+
+def test_retry_delay_reads_http_date():
+    response = SimpleNamespace(headers={'Retry-After': formatdate(usegmt=True)})
+    assert uploader._retry_delay(response, 3) <= 1